@@ -6,6 +6,7 @@ import os
 import sys
 import threading
 from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
 
 logger = logging.getLogger("kaicad.config.settings")
@@ -43,6 +44,16 @@ KEYRING_SERVICE = "kAIcad"
 KEYRING_USERNAME = "openai_api_key"
 
 
+@lru_cache(maxsize=1)
+def _keyring_api_key() -> str | None:
+    """Read the stored API key once per process; keychain lookups are IPC round-trips.
+
+    Errors propagate and are not cached. Settings.save() and Settings.reload()
+    clear the cache.
+    """
+    return keyring.get_password(KEYRING_SERVICE, KEYRING_USERNAME)
+
+
 @dataclass
 class Settings:
     openai_model: str = "gpt-4o-mini"  # Use real model name (efficient and cost-effective)
@@ -77,7 +88,7 @@ class Settings:
         # Fall back to keyring if env var not set
         if not api_key and KEYRING_AVAILABLE:
             try:
-                stored_key = keyring.get_password(KEYRING_SERVICE, KEYRING_USERNAME)
+                stored_key = _keyring_api_key()
                 if stored_key:
                     api_key = stored_key
             except Exception:
@@ -101,6 +112,12 @@ class Settings:
             dock_right=dock_right,
         )
 
+    @classmethod
+    def reload(cls) -> "Settings":
+        """Load settings, re-reading the API key from the keyring"""
+        _keyring_api_key.cache_clear()
+        return cls.load()
+
     def save(self) -> None:
         """Save settings to config file and keyring (thread-safe)"""
         with self._lock:
@@ -112,6 +129,8 @@ class Settings:
                     keyring.set_password(KEYRING_SERVICE, KEYRING_USERNAME, self.openai_api_key)
                 except Exception as e:
                     logger.warning(f"Failed to save API key to keyring: {e}")
+                finally:
+                    _keyring_api_key.cache_clear()
 
             # Save other settings to config file (exclude API key if using keyring)
             config_data = asdict(self)
@@ -1,11 +1,118 @@
 """Schematic inspection utilities for analyzing KiCad schematics including hierarchical sheets."""
 
+import copy
+import fnmatch
 import re
+import sys
+from collections import namedtuple
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 from skip.eeschema import schematic as sch
 
+from kaicad.core.writer import get_symbol_ref
+
+
+@dataclass
+class ParsedSchematic:
+    """A parsed schematic plus lookup indices built once at parse time."""
+
+    doc: sch.Schematic
+    by_ref: Dict[str, object] = field(default_factory=dict)  # upper-cased reference -> symbol
+    by_net: Dict[str, List] = field(default_factory=dict)  # label text -> labels
+
+
+def _index_schematic(doc: sch.Schematic) -> ParsedSchematic:
+    """
+    Index symbols by reference and labels by net name in a single pass each.
+
+    Keys are interned so lookups with other interned strings (identifiers, literals,
+    repeated refs) hit the identity fast path in dict comparison.
+    """
+    parsed = ParsedSchematic(doc=doc)
+
+    for sym in doc.symbol:
+        try:
+            ref = get_symbol_ref(sym)
+        except Exception:
+            continue
+        if ref:
+            parsed.by_ref.setdefault(sys.intern(ref.upper()), sym)
+
+    try:
+        for label in doc.label:
+            label_text = _label_text(label)
+            parsed.by_net.setdefault(sys.intern(label_text), []).append(label)
+    except Exception:
+        pass
+
+    return parsed
+
+
+def _position(item) -> tuple:
+    """(x, y) of a symbol or label from its ``at`` node; (0, 0) if it has none."""
+    at = getattr(item, "at", None)
+    if at is None:
+        return (0, 0)
+    if hasattr(at, "x") and hasattr(at, "y"):
+        return (at.x, at.y)
+    coords = getattr(at, "value", None)
+    if isinstance(coords, (list, tuple)) and len(coords) >= 2:
+        return (coords[0], coords[1])
+    return (0, 0)
+
+
+def _symbol_value(sym) -> str:
+    """Value field of a symbol (e.g. "10k"), or "N/A" if it has none."""
+    if getattr(sym, "allValues", None):
+        raw = str(sym.allValues[0])
+        return raw.split("=")[-1].strip() if "=" in raw else raw.strip()
+    value_prop = getattr(sym, "Value", None)
+    if value_prop is not None and getattr(value_prop, "value", None):
+        return str(value_prop.value)
+    return "N/A"
+
+
+def _symbol_lib_id(sym) -> str:
+    """Library id of a symbol (e.g. "Device:R"), or "Unknown" if it has none."""
+    lib_id = getattr(sym, "libId", None)
+    if lib_id is None:
+        lib_id = getattr(getattr(sym, "lib_id", None), "value", None)
+    return str(lib_id) if lib_id else "Unknown"
+
+
+def _symbol_record(sym, ref: str) -> Dict:
+    """Basic component record (ref, value, symbol, position) shared by the inspection helpers."""
+    return {"ref": ref, "value": _symbol_value(sym), "symbol": _symbol_lib_id(sym), "position": _position(sym)}
+
+
+def _label_text(label) -> str:
+    """Net name carried by a label."""
+    return str(label.value)
+
+
+@lru_cache(maxsize=32)
+def _parse_schematic(path: str, mtime_ns: int, size: int) -> ParsedSchematic:
+    """Parse and index a schematic file; cached per (path, mtime, size) so unchanged files are parsed once."""
+    return _index_schematic(sch.Schematic(path))
+
+
+def _load_schematic(sch_path: Path) -> ParsedSchematic:
+    """
+    Return the parsed schematic for ``sch_path``, reusing a cached parse while
+    the file is unchanged on disk.
+
+    The returned document is shared between callers and must be treated as read-only.
+    """
+    path = str(sch_path)
+    st = Path(path).stat()
+    # Size is part of the key so a rewrite within one coarse mtime tick is still seen
+    return _parse_schematic(path, st.st_mtime_ns, st.st_size)
+
 
 def inspect_schematic(sch_path: Path) -> Dict:
     """
@@ -17,66 +124,49 @@ def inspect_schematic(sch_path: Path) -> Dict:
     - labels: List of net labels with positions
     - hierarchy: List of hierarchical sheets (if any)
     - stats: Statistics about the schematic
+
+    Results are memoized per (path, mtime, size) for the 8 most recent files;
+    each call gets its own copy, so callers may mutate it freely.
     """
     try:
-        doc = sch.Schematic(str(sch_path))
+        st = Path(sch_path).stat()
+    except OSError as e:
+        return {"success": False, "error": str(e), "file": str(sch_path)}
+    return copy.deepcopy(_inspect_schematic_cached(str(sch_path), st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=8)
+def _inspect_schematic_cached(sch_path: str, mtime_ns: int, size: int) -> Dict:
+    """Build the inspect_schematic result for one version of a file; shared, never handed out directly."""
+    try:
+        doc = _parse_schematic(sch_path, mtime_ns, size).doc
 
         # Get components
         components = []
         for sym in doc.symbol:
             try:
                 # Use the same helper function as writer.py
-                from kaicad.core.writer import get_symbol_ref
-
                 ref = get_symbol_ref(sym)
                 if not ref:
                     continue
 
-                # Try to get value - check various attributes
-                value = "N/A"
-                if hasattr(sym, "allValues") and sym.allValues:
-                    value = (
-                        str(sym.allValues[0]).split("=")[-1].strip()
-                        if "=" in str(sym.allValues[0])
-                        else str(sym.allValues[0]).strip()
-                    )
-
-                # Get position if available
-                pos = (0, 0)
-                if hasattr(sym, "at") and sym.at:
-                    pos = (sym.at.x if hasattr(sym.at, "x") else 0, sym.at.y if hasattr(sym.at, "y") else 0)
-
-                # Get lib_id
-                lib_id = str(sym.libId) if hasattr(sym, "libId") else "Unknown"
-
-                components.append({"ref": ref, "value": value, "symbol": lib_id, "position": pos})
+                components.append(_symbol_record(sym, ref))
             except Exception:
                 # Skip symbols that can't be read
                 continue
 
         # Get nets - simplified, just extract from labels and wires
         nets = []
-        try:
-            # Get labels which represent nets
-            if hasattr(doc, "labels"):
-                for label in doc.labels():
-                    label_text = str(label.text) if hasattr(label, "text") else str(label)
-                    if label_text and label_text not in nets:
-                        nets.append(label_text)
-        except Exception:
-            nets = []
-
-        # Get labels
         labels = []
         try:
-            if hasattr(doc, "labels"):
-                for label in doc.labels():
-                    label_text = str(label.text) if hasattr(label, "text") else str(label)
-                    pos = (0, 0)
-                    if hasattr(label, "at") and label.at:
-                        pos = (label.at.x if hasattr(label.at, "x") else 0, label.at.y if hasattr(label.at, "y") else 0)
-                    labels.append({"text": label_text, "position": pos})
+            # Labels name the nets
+            for label in doc.label:
+                label_text = _label_text(label)
+                if label_text and label_text not in nets:
+                    nets.append(label_text)
+                labels.append({"text": label_text, "position": _position(label)})
         except Exception:
+            nets = []
             labels = []
 
         # Get hierarchical sheets - simplified
@@ -125,59 +215,73 @@ def inspect_schematic(sch_path: Path) -> Dict:
         return {"success": False, "error": str(e), "file": str(sch_path)}
 
 
+# Column-oriented view of component records used when formatting reports
+ComponentTable = namedtuple("ComponentTable", "refs values symbols positions")
+
+
+def _component_table(components: List[Dict]) -> ComponentTable:
+    """Split component dicts into parallel columns, sorted by reference."""
+    rows = sorted(
+        ((comp["ref"], comp["value"], comp["symbol"], comp.get("position", (0, 0))) for comp in components),
+        key=itemgetter(0),
+    )
+    if not rows:
+        return ComponentTable((), (), (), ())
+    return ComponentTable(*zip(*rows))
+
+
 def format_inspection_report(inspection: Dict) -> str:
     """Format inspection results as a human-readable report."""
     if not inspection.get("success"):
         return f"❌ Failed to inspect schematic: {inspection.get('error', 'Unknown error')}"
 
-    report = []
-    report.append("📊 **Schematic Inspection Report**")
-    report.append(f"File: {Path(inspection['file']).name}")
-    report.append("")
+    report: List[str] = ["📊 **Schematic Inspection Report**", f"File: {Path(inspection['file']).name}", ""]
+    append = report.append
 
     stats = inspection.get("stats", {})
-    report.append("**Statistics:**")
-    report.append(f"  • Components: {stats.get('total_components', 0)}")
-    report.append(f"  • Nets: {stats.get('total_nets', 0)}")
-    report.append(f"  • Labels: {stats.get('total_labels', 0)}")
-    report.append(f"  • Hierarchical Sheets: {stats.get('total_sheets', 0)}")
-    report.append("")
+    append("**Statistics:**")
+    append(f"  • Components: {stats.get('total_components', 0)}")
+    append(f"  • Nets: {stats.get('total_nets', 0)}")
+    append(f"  • Labels: {stats.get('total_labels', 0)}")
+    append(f"  • Hierarchical Sheets: {stats.get('total_sheets', 0)}")
+    append("")
 
     # Component breakdown
     if stats.get("component_types"):
-        report.append("**Component Types:**")
+        append("**Component Types:**")
         for comp_type, count in sorted(stats["component_types"].items()):
-            report.append(f"  • {comp_type}: {count}")
-        report.append("")
+            append(f"  • {comp_type}: {count}")
+        append("")
 
     # Hierarchical sheets
     if inspection.get("hierarchy"):
-        report.append("**Hierarchical Sheets:**")
+        append("**Hierarchical Sheets:**")
         for sheet in inspection["hierarchy"]:
-            report.append(f"  • {sheet['name']}")
+            append(f"  • {sheet['name']}")
             if sheet.get("file"):
-                report.append(f"    File: {sheet['file']}")
-            report.append(f"    Position: {sheet['position']}")
-        report.append("")
+                append(f"    File: {sheet['file']}")
+            append(f"    Position: {sheet['position']}")
+        append("")
 
     # List components
     components = inspection.get("components", [])
     if components:
-        report.append(f"**Components ({len(components)}):**")
-        for comp in sorted(components, key=lambda x: x["ref"])[:20]:  # Limit to first 20
-            report.append(f"  • {comp['ref']}: {comp['value']} ({comp['symbol']})")
+        append(f"**Components ({len(components)}):**")
+        table = _component_table(components)
+        for ref, value, symbol in islice(zip(table.refs, table.values, table.symbols), 20):  # Limit to first 20
+            append(f"  • {ref}: {value} ({symbol})")
         if len(components) > 20:
-            report.append(f"  ... and {len(components) - 20} more")
-        report.append("")
+            append(f"  ... and {len(components) - 20} more")
+        append("")
 
     # List nets
     nets = inspection.get("nets", [])
     if nets:
-        report.append(f"**Nets ({len(nets)}):**")
-        for net in sorted(nets)[:15]:  # Limit to first 15
-            report.append(f"  • {net}")
+        append(f"**Nets ({len(nets)}):**")
+        for net in islice(sorted(nets), 15):  # Limit to first 15
+            append(f"  • {net}")
         if len(nets) > 15:
-            report.append(f"  ... and {len(nets) - 15} more")
+            append(f"  ... and {len(nets) - 15} more")
 
     return "\n".join(report)
 
@@ -219,83 +323,70 @@ def find_component_by_reference(sch_path: Path, ref: str) -> Optional[Dict]:
     - Additional fields
     """
     try:
-        doc = sch.Schematic(str(sch_path))
+        sym = _load_schematic(sch_path).by_ref.get(ref.upper())
+        if sym is None:
+            return {"success": False, "error": f"Component {ref} not found"}
 
-        # Search for the component
-        for sym in doc.symbol:
-            try:
-                sym_ref = sym.ref()
-                if sym_ref.upper() == ref.upper():
-                    # Found it! Get detailed info
-                    info = {
-                        "ref": sym_ref,
-                        "value": sym.value() if hasattr(sym, "value") else "N/A",
-                        "symbol": sym.lib_id() if hasattr(sym, "lib_id") else "Unknown",
-                        "position": sym.pos() if hasattr(sym, "pos") else (0, 0),
-                        "rotation": sym.rotation() if hasattr(sym, "rotation") else 0,
-                        "pins": [],
-                        "fields": {},
+        info = _symbol_record(sym, get_symbol_ref(sym))
+        at = getattr(getattr(sym, "at", None), "value", None)
+        info["rotation"] = at[2] if isinstance(at, (list, tuple)) and len(at) > 2 else 0
+        info["pins"] = []
+        info["fields"] = {}
+
+        # Get pins
+        try:
+            for pin in sym.pin:
+                info["pins"].append(
+                    {
+                        "number": str(getattr(pin, "number", "?")),
+                        "name": str(getattr(pin, "name", "?")),
+                        "type": str(getattr(pin, "type", "?")),
                     }
+                )
+        except Exception:
+            pass
 
-                    # Get pins
-                    try:
-                        if hasattr(sym, "pins"):
-                            for pin in sym.pins():
-                                pin_info = {
-                                    "number": pin.number() if hasattr(pin, "number") else "?",
-                                    "name": pin.name() if hasattr(pin, "name") else "?",
-                                    "type": pin.type() if hasattr(pin, "type") else "?",
-                                }
-                                info["pins"].append(pin_info)
-                    except Exception:
-                        pass
-
-                    # Get additional fields
-                    try:
-                        if hasattr(sym, "fields"):
-                            for field in sym.fields():
-                                field_name = field.name() if hasattr(field, "name") else str(field)
-                                field_value = field.value() if hasattr(field, "value") else str(field)
-                                info["fields"][field_name] = field_value
-                    except Exception:
-                        pass
-
-                    return info
-            except Exception:
-                continue
+        # Get additional fields
+        try:
+            for prop in sym.property:
+                info["fields"][str(prop.name)] = str(prop.value)
+        except Exception:
+            pass
 
-        return {"success": False, "error": f"Component {ref} not found"}
+        info["success"] = True
+        return info
 
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
-def find_components_by_pattern(sch_path: Path, pattern: str) -> List[Dict]:
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """Translate a shell-style wildcard to a case-insensitive regex, cached per pattern string."""
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+
+
+def find_components_by_pattern(sch_path: Path, pattern: Union[str, re.Pattern]) -> List[Dict]:
     """
     Find all components matching a pattern (e.g., "C*", "R4*", "U[1-3]").
 
+    A pre-compiled ``re.Pattern`` is used as-is; strings are shell-style
+    wildcards (``*``, ``?``, ``[...]``) matched case-insensitively against the
+    whole reference.
+
     Returns list of matching components with basic info.
     """
     try:
-        doc = sch.Schematic(str(sch_path))
+        doc = _load_schematic(sch_path).doc
         matches = []
 
-        # Convert wildcard pattern to regex
-        regex_pattern = pattern.replace("*", ".*").replace("?", ".")
-        regex = re.compile(regex_pattern, re.IGNORECASE)
+        regex = pattern if isinstance(pattern, re.Pattern) else _compile_pattern(pattern)
 
         for sym in doc.symbol:
             try:
-                sym_ref = sym.ref()
-                if regex.match(sym_ref):
-                    matches.append(
-                        {
-                            "ref": sym_ref,
-                            "value": sym.value() if hasattr(sym, "value") else "N/A",
-                            "symbol": sym.lib_id() if hasattr(sym, "lib_id") else "Unknown",
-                            "position": sym.pos() if hasattr(sym, "pos") else (0, 0),
-                        }
-                    )
+                sym_ref = get_symbol_ref(sym)
+                if sym_ref and regex.match(sym_ref):
+                    matches.append(_symbol_record(sym, sym_ref))
             except Exception:
                 continue
 
@@ -315,7 +406,8 @@ def inspect_net_connections(sch_path: Path, net_name: str) -> Dict:
     - Net class/properties if available
     """
     try:
-        doc = sch.Schematic(str(sch_path))
+        parsed = _load_schematic(sch_path)
+        doc = parsed.doc
 
         connections = []
         labels_on_net = []
@@ -338,12 +430,8 @@ def inspect_net_connections(sch_path: Path, net_name: str) -> Dict:
 
         # Find labels with this net name
         try:
-            for label in doc.labels():
-                label_text = label.text() if hasattr(label, "text") else str(label)
-                if label_text == net_name:
-                    labels_on_net.append(
-                        {"text": label_text, "position": label.pos() if hasattr(label, "pos") else (0, 0)}
-                    )
+            for label in parsed.by_net.get(net_name, []):
+                labels_on_net.append({"text": net_name, "position": _position(label)})
         except Exception:
             pass
 
@@ -366,12 +454,13 @@ def get_component_connections(sch_path: Path, ref: str) -> Dict:
     Returns component info plus all connected nets per pin.
     """
     try:
-        doc = sch.Schematic(str(sch_path))
+        doc = _load_schematic(sch_path).doc
 
         # Find the component first
         component_info = find_component_by_reference(sch_path, ref)
-        if not component_info:
-            return {"success": False, "error": f"Component {ref} not found"}
+        if not component_info or not component_info.get("success"):
+            error = (component_info or {}).get("error", f"Component {ref} not found")
+            return {"success": False, "error": error, "ref": ref}
 
         # Try to find what nets are connected to each pin
         # This is complex and depends on the schematic structure
@@ -382,14 +471,14 @@ def get_component_connections(sch_path: Path, ref: str) -> Dict:
             comp_pos = component_info.get("position", (0, 0))
             nearby_labels = []
 
-            for label in doc.labels():
-                label_pos = label.pos() if hasattr(label, "pos") else (0, 0)
+            for label in doc.label:
+                label_pos = _position(label)
                 # Check if label is near component (within 20mm)
                 distance = ((comp_pos[0] - label_pos[0]) ** 2 + (comp_pos[1] - label_pos[1]) ** 2) ** 0.5
                 if distance < 20:
                     nearby_labels.append(
                         {
-                            "text": label.text() if hasattr(label, "text") else str(label),
+                            "text": _label_text(label),
                             "position": label_pos,
                             "distance": distance,
                         }
@@ -412,30 +501,24 @@ def search_components(sch_path: Path, search_term: str) -> List[Dict]:
     Returns list of matching components.
     """
     try:
-        doc = sch.Schematic(str(sch_path))
+        doc = _load_schematic(sch_path).doc
         matches = []
         search_lower = search_term.lower()
 
         for sym in doc.symbol:
             try:
-                sym_ref = sym.ref()
-                sym_value = sym.value() if hasattr(sym, "value") else ""
-                sym_lib = sym.lib_id() if hasattr(sym, "lib_id") else ""
+                sym_ref = get_symbol_ref(sym)
+                if not sym_ref:
+                    continue
+                record = _symbol_record(sym, sym_ref)
 
                 # Check if search term matches ref, value, or symbol
                 if (
                     search_lower in sym_ref.lower()
-                    or search_lower in str(sym_value).lower()
-                    or search_lower in str(sym_lib).lower()
+                    or search_lower in record["value"].lower()
+                    or search_lower in record["symbol"].lower()
                 ):
-                    matches.append(
-                        {
-                            "ref": sym_ref,
-                            "value": sym_value,
-                            "symbol": sym_lib,
-                            "position": sym.pos() if hasattr(sym, "pos") else (0, 0),
-                        }
-                    )
+                    matches.append(record)
             except Exception:
                 continue
 
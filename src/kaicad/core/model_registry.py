@@ -7,9 +7,7 @@ replacing hard-coded fantasy model names with real OpenAI models.
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Optional
-
-from openai import OpenAI
+from typing import Dict, Optional, Tuple
 
 from kaicad.core.models import ModelConfig
 
@@ -61,29 +59,35 @@ _REAL_MODEL_REGISTRY: Dict[str, ModelConfig] = {
 }
 
 # Fallback models if OpenAI API query fails
-_FALLBACK_MODEL_LIST = ["gpt-4o-mini", "gpt-4o", "gpt-4-turbo", "gpt-4"]
+_FALLBACK_MODELS = ("gpt-4o-mini", "gpt-4o", "gpt-4-turbo", "gpt-4")
 
 
 class ModelRegistry:
     """Central registry for OpenAI models with dynamic fetching capabilities."""
 
-    _cached_models: Optional[List[str]] = None
+    # Cached as tuples so every caller can share the same immutable object
+    _cached_models: Optional[Tuple[str, ...]] = None
+    # JSON-mode subset of _cached_models, derived once per fetched list
+    _cached_planning_models: Optional[Tuple[str, ...]] = None
 
     @staticmethod
-    def get_available_models() -> List[str]:
-        """Get list of available model names.
+    def get_available_models() -> Tuple[str, ...]:
+        """Get available model names.
 
         First tries to fetch from OpenAI API, falls back to known list.
         Results are cached to avoid repeated API calls.
 
         Returns:
-            List of available model names
+            Tuple of available model names (the same object until clear_cache())
         """
         if ModelRegistry._cached_models is not None:
             return ModelRegistry._cached_models
 
         try:
-            # Try to fetch real models from OpenAI
+            # Try to fetch real models from OpenAI (imported here so importing
+            # the registry doesn't pull in the openai package)
+            from openai import OpenAI
+
             client = OpenAI()
             models = client.models.list()
             available = [
@@ -93,8 +97,8 @@ class ModelRegistry:
             ]
             if available:
                 logger.info(f"Fetched {len(available)} models from OpenAI API")
-                ModelRegistry._cached_models = sorted(
-                    available, key=lambda x: _REAL_MODEL_REGISTRY[x].cost_per_1k_input
+                ModelRegistry._cached_models = tuple(
+                    sorted(available, key=lambda x: _REAL_MODEL_REGISTRY[x].cost_per_1k_input)
                 )
                 return ModelRegistry._cached_models
         except Exception as e:
@@ -102,30 +106,32 @@ class ModelRegistry:
 
         # Fallback to known models
         logger.info("Using fallback model list")
-        ModelRegistry._cached_models = _FALLBACK_MODEL_LIST
+        ModelRegistry._cached_models = _FALLBACK_MODELS
         return ModelRegistry._cached_models
 
     @staticmethod
-    def get_available_models_for_planning() -> List[str]:
+    def get_available_models_for_planning() -> Tuple[str, ...]:
         """Get models suitable for plan generation (requires JSON mode).
 
         Returns:
-            List of model names that support JSON mode
+            Tuple of model names that support JSON mode
         """
         all_models = ModelRegistry.get_available_models()
-        return [
-            model
-            for model in all_models
-            if model in _REAL_MODEL_REGISTRY
-            and _REAL_MODEL_REGISTRY[model].supports_json_mode
-        ]
+        if ModelRegistry._cached_planning_models is None:
+            ModelRegistry._cached_planning_models = tuple(
+                model
+                for model in all_models
+                if model in _REAL_MODEL_REGISTRY
+                and _REAL_MODEL_REGISTRY[model].supports_json_mode
+            )
+        return ModelRegistry._cached_planning_models
 
     @staticmethod
-    def get_available_models_for_chat() -> List[str]:
+    def get_available_models_for_chat() -> Tuple[str, ...]:
         """Get models suitable for chat conversations.
 
         Returns:
-            List of model names suitable for chat
+            Tuple of model names suitable for chat
         """
         # For now, all models support chat
         return ModelRegistry.get_available_models()
@@ -182,6 +188,7 @@ class ModelRegistry:
     def clear_cache() -> None:
         """Clear cached model list to force refresh."""
         ModelRegistry._cached_models = None
+        ModelRegistry._cached_planning_models = None
 
 
 # Public API
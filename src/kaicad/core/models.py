@@ -6,9 +6,9 @@ from dataclasses import dataclass
 from typing import Dict, Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ModelConfig:
-    """Configuration for an OpenAI model."""
+    """Configuration for an OpenAI model. Immutable; shared by every registry lookup."""
 
     name: str
     max_tokens: int
@@ -69,6 +69,14 @@ _MODEL_REGISTRY: Dict[str, ModelConfig] = {
     ),
 }
 
+# Flattened name -> real OpenAI model name, so get_real_model_name is a single lookup
+_REAL_MODEL_NAMES: Dict[str, str] = {name: config.name for name, config in _MODEL_REGISTRY.items()}
+
+# The registry is fixed at import, so the supported-model listing is computed once
+_SUPPORTED_MODELS: tuple[str, ...] = tuple(_MODEL_REGISTRY)
+_SUPPORTED_MSG = ", ".join(_SUPPORTED_MODELS)
+_JSON_MODELS: frozenset[str] = frozenset(name for name, config in _MODEL_REGISTRY.items() if config.supports_json_mode)
+
 
 def get_model_config(model_name: str) -> Optional[ModelConfig]:
     """Get configuration for a model by name.
@@ -91,10 +99,7 @@ def get_real_model_name(model_name: str) -> str:
     Returns:
         Real model name to use with OpenAI API
     """
-    config = get_model_config(model_name)
-    if config:
-        return config.name
-    return model_name  # Return as-is if not in registry
+    return _REAL_MODEL_NAMES.get(model_name, model_name)  # Return as-is if not in registry
 
 
 def is_model_supported(model_name: str) -> bool:
@@ -115,7 +120,7 @@ def list_supported_models() -> list[str]:
     Returns:
         List of model names
     """
-    return list(_MODEL_REGISTRY.keys())
+    return list(_SUPPORTED_MODELS)
 
 
 def get_default_model() -> str:
@@ -136,14 +141,13 @@ def validate_model_for_json(model_name: str) -> tuple[bool, str]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    config = get_model_config(model_name)
-    if not config:
-        return False, f"Model '{model_name}' is not supported. Supported models: {', '.join(list_supported_models())}"
+    if model_name in _JSON_MODELS:
+        return True, ""
 
-    if not config.supports_json_mode:
-        return False, f"Model '{model_name}' does not support JSON mode (required for plan generation)"
+    if model_name not in _MODEL_REGISTRY:
+        return False, f"Model '{model_name}' is not supported. Supported models: {_SUPPORTED_MSG}"
 
-    return True, ""
+    return False, f"Model '{model_name}' does not support JSON mode (required for plan generation)"
 
 
 # Public API
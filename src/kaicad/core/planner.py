@@ -3,7 +3,7 @@ import logging
 import os
 
 from kaicad.core.models import get_default_model, get_real_model_name, validate_model_for_json
-from kaicad.schema.plan import PLAN_SCHEMA_VERSION, Diagnostic, Plan, PlanResult
+from kaicad.schema.plan import PLAN_SCHEMA_VERSION, Diagnostic, Plan, PlanResult, loads_plan
 
 logger = logging.getLogger(__name__)
 
@@ -53,10 +53,12 @@ def plan_from_prompt(prompt: str) -> PlanResult:
         return PlanResult(plan=_demo_plan(), diagnostics=diagnostics)
 
     # Choose model (env override supported, KAI_MODEL deprecated but still checked)
-    model = os.getenv("OPENAI_MODEL") or os.getenv("KAI_MODEL", get_default_model())
+    openai_model = os.getenv("OPENAI_MODEL")
+    kai_model = os.getenv("KAI_MODEL")
+    model = openai_model or (kai_model if kai_model is not None else get_default_model())
 
     # Warn if using deprecated KAI_MODEL
-    if os.getenv("KAI_MODEL") and not os.getenv("OPENAI_MODEL"):
+    if kai_model and not openai_model:
         diagnostics.append(
             Diagnostic(
                 stage="planner",
@@ -135,8 +137,7 @@ def plan_from_prompt(prompt: str) -> PlanResult:
                         content = parts[0].text
             if not content:
                 raise RuntimeError("Empty response content from Responses API")
-            data = json.loads(content)
-            plan = Plan.model_validate(data)
+            plan = loads_plan(content)
             diagnostics.append(
                 Diagnostic(
                     stage="planner",
@@ -182,8 +183,7 @@ def plan_from_prompt(prompt: str) -> PlanResult:
 
         completion = client.chat.completions.create(**completion_params)
         content = completion.choices[0].message.content
-        data = json.loads(content)
-        plan = Plan.model_validate(data)
+        plan = loads_plan(content)
         diagnostics.append(
             Diagnostic(
                 stage="planner",
@@ -105,6 +105,65 @@ Do NOT include explanations, markdown, or anything other than the JSON object.
 """
 
 
+def _responses_api_text(client, model: str, prompt: str, schema: dict) -> str:
+    """Request a plan through the Responses API and return the raw JSON text.
+
+    Raises:
+        RuntimeError: If the response carries no text
+    """
+    response = client.responses.create(
+        model=model,
+        input=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        response_format={
+            "type": "json_schema",
+            "json_schema": {
+                "name": "kAIcadPlan",
+                "schema": schema,
+                "strict": True,
+            },
+        },
+    )
+
+    # Extract response content
+    content = None
+    if hasattr(response, "output_text"):
+        content = response.output_text
+    elif hasattr(response, "output") and response.output:
+        if hasattr(response.output[0], "content"):
+            parts = response.output[0].content
+            if parts and hasattr(parts[0], "text"):
+                content = parts[0].text
+
+    if not content:
+        raise RuntimeError("Empty response from OpenAI Responses API")
+    return content
+
+
+def _chat_api_text(client, model: str, temperature: float, prompt: str) -> str:
+    """Request a plan through Chat Completions in JSON mode and return the raw JSON text.
+
+    Raises:
+        RuntimeError: If the completion carries no text
+    """
+    completion = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        response_format={"type": "json_object"},
+        temperature=temperature,
+    )
+    content = completion.choices[0].message.content
+
+    if not content:
+        raise RuntimeError("Empty response from OpenAI Chat API")
+    return content
+
+
 def plan_from_prompt(
     prompt: str,
     settings: Optional[Settings] = None,
@@ -192,35 +251,7 @@ def plan_from_prompt(
 
         try:
             # Attempt Responses API (SDK v1.60.0+)
-            response = client.responses.create(
-                model=model,
-                input=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "kAIcadPlan",
-                        "schema": schema,
-                        "strict": True,
-                    },
-                },
-            )
-
-            # Extract response content
-            content = None
-            if hasattr(response, "output_text"):
-                content = response.output_text
-            elif hasattr(response, "output") and response.output:
-                if hasattr(response.output[0], "content"):
-                    parts = response.output[0].content
-                    if parts and hasattr(parts[0], "text"):
-                        content = parts[0].text
-
-            if not content:
-                raise RuntimeError("Empty response from OpenAI Responses API")
-
+            content = _responses_api_text(client, model, prompt, schema)
             data = json.loads(content)
             plan = Plan.model_validate(data)
 
@@ -254,23 +285,7 @@ def plan_from_prompt(
 
         client = OpenAI(api_key=settings.openai_api_key)
 
-        # Build completion request
-        completion_params = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": prompt},
-            ],
-            "response_format": {"type": "json_object"},
-            "temperature": settings.openai_temperature,
-        }
-
-        completion = client.chat.completions.create(**completion_params)
-        content = completion.choices[0].message.content
-
-        if not content:
-            raise RuntimeError("Empty response from OpenAI Chat API")
-
+        content = _chat_api_text(client, model, settings.openai_temperature, prompt)
         data = json.loads(content)
         plan = Plan.model_validate(data)
 
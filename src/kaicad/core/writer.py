@@ -1,16 +1,37 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List
+
 from skip.eeschema.schematic import Schematic
 from skip.eeschema.schematic.symbol import Symbol
 
-from kaicad.schema.plan import PLAN_SCHEMA_VERSION, ApplyResult, Diagnostic, Plan
+from kaicad.schema.plan import PLAN_SCHEMA_VERSION, AddComponent, ApplyResult, Diagnostic, Label, Plan, Wire
 from kaicad.utils.validation import validate_coordinate, validate_symbol_name, validate_wire_format
 
 # KiCad grid constant: 2.54mm (100 mil) - standard schematic grid
 GRID_MM = 2.54
 
+# snap_to_grid works in integer units of 0.1 µm so results are exact decimals
+_SNAP_SCALE = 10000
+
 
 def snap_to_grid(value: float, grid: float = GRID_MM) -> float:
-    """Snap a coordinate to the nearest grid point for clean diffs"""
-    return round(value / grid) * grid
+    """
+    Snap a coordinate to the nearest grid point for clean diffs.
+
+    Uses integer arithmetic so the result is always the shortest decimal for the
+    grid multiple (e.g. 33 * 2.54 gives 83.82, not 83.82000000000001).
+    Exact midpoints round up.
+    """
+    step = round(grid * _SNAP_SCALE)
+    n = (round(value * _SNAP_SCALE) + step // 2) // step
+    return n * step / _SNAP_SCALE
+
+
+def snap_values(values: Iterable[float], grid: float = GRID_MM) -> List[float]:
+    """Snap many coordinates at once; same results as snap_to_grid, with the grid step computed once"""
+    step = round(grid * _SNAP_SCALE)
+    half = step // 2
+    return [(round(v * _SNAP_SCALE) + half) // step * step / _SNAP_SCALE for v in values]
 
 
 def get_symbol_ref(sym) -> str | None:
@@ -188,301 +209,348 @@ def lookup_pin_coords(ref: str, pin_name: str, ref_index: dict, pin_index: dict,
         return None
 
 
-def apply_plan(doc: Schematic, plan: Plan) -> ApplyResult:
-    """
-    Apply a plan to a schematic document.
+@dataclass
+class _ApplyContext:
+    """Mutable state shared by the op handlers during a single apply_plan call."""
 
-    Coordinates are snapped to GRID_MM (2.54mm) for deterministic placement.
-    Wire operations use get_pin_locations() for all component types.
+    doc: Schematic
+    diagnostics: List[Diagnostic]
+    affected_refs: List[str]
+    ref_index: dict
+    pin_index: dict
+    # Set when components are added so the next wire rebuilds the indexes
+    components_added: bool = False
 
-    Returns an ApplyResult with diagnostics instead of printing to console.
-    """
-    diagnostics = []
-    affected_refs = []
 
-    # GATE: Enforce schema version before any operations
-    if plan.plan_version != PLAN_SCHEMA_VERSION:
+def _apply_add_component(ctx: _ApplyContext, op: AddComponent) -> None:
+    """Place a library symbol on the schematic."""
+    doc = ctx.doc
+    diagnostics = ctx.diagnostics
+    affected_refs = ctx.affected_refs
+
+    # Validate symbol name to prevent injection attacks (SECURITY)
+    is_valid_symbol, symbol_error = validate_symbol_name(op.symbol)
+    if not is_valid_symbol:
         diagnostics.append(
             Diagnostic(
-                stage="validator",
+                stage="writer",
                 severity="error",
-                message=f"Plan schema version mismatch: plan has v{plan.plan_version}, writer expects v{PLAN_SCHEMA_VERSION}",
-                suggestion=f"Re-run the planner to generate a v{PLAN_SCHEMA_VERSION} plan, or run a schema migrator if available",
+                ref=op.ref,
+                message=f"Invalid symbol name: {symbol_error}",
+                suggestion="Use valid KiCad format 'Library:Name' (e.g., 'Device:R')",
             )
         )
-        return ApplyResult(success=False, diagnostics=diagnostics, affected_refs=[])
-
-    # Build indexes once for O(1) lookups during operations
-    ref_index = build_ref_index(doc)
-    pin_index = build_pin_index(ref_index)
+        return
     
-    # Track if we need to rebuild indexes after component additions
-    components_added = False
-
-    for op in plan.ops:
-        if op.op == "add_component":
-            # Validate symbol name to prevent injection attacks (SECURITY)
-            is_valid_symbol, symbol_error = validate_symbol_name(op.symbol)
-            if not is_valid_symbol:
+    # Try preferred API path if available (patched in tests)
+    try:
+        if hasattr(Symbol, "from_lib"):
+            # Validate coordinate format first
+            coord_valid, coord_error, coords = validate_coordinate(op.at)
+            if not coord_valid:
                 diagnostics.append(
                     Diagnostic(
                         stage="writer",
                         severity="error",
                         ref=op.ref,
-                        message=f"Invalid symbol name: {symbol_error}",
-                        suggestion="Use valid KiCad format 'Library:Name' (e.g., 'Device:R')",
+                        message=f"Invalid coordinate: {coord_error}",
+                        suggestion="Use [x, y] format with numeric values",
                     )
                 )
-                continue
+                return
             
-            # Try preferred API path if available (patched in tests)
-            try:
-                if hasattr(Symbol, "from_lib"):
-                    # Validate coordinate format first
-                    coord_valid, coord_error, coords = validate_coordinate(op.at)
-                    if not coord_valid:
-                        diagnostics.append(
-                            Diagnostic(
-                                stage="writer",
-                                severity="error",
-                                ref=op.ref,
-                                message=f"Invalid coordinate: {coord_error}",
-                                suggestion="Use [x, y] format with numeric values",
-                            )
-                        )
+            x, y = snap_values(coords)
+            
+            # Debug: check if Symbol.from_lib is actually callable
+            if not callable(Symbol.from_lib):
+                raise RuntimeError(f"Symbol.from_lib exists but is not callable: {type(Symbol.from_lib)}")
+            
+            # Use the from_lib API with proper parameters
+            # Signature: from_lib(schematic, lib_id: str, reference: str, at_x: float, at_y: float, ...)
+            sym = Symbol.from_lib(
+                doc,
+                lib_id=op.symbol,
+                reference=op.ref,
+                at_x=x,
+                at_y=y,
+                unit=1,
+                in_bom=True,
+                on_board=True,
+                dnp=False
+            )  # type: ignore[attr-defined]
+            
+            # Set value if provided (direct assignment now supported in fork)
+            if op.value:
+                sym.Value = op.value
+            
+            # Rotation (best-effort)
+            if getattr(op, "rot", 0):
+                for attr in ("rotation", "rot"):
+                    try:
+                        setattr(sym, attr, op.rot)
+                        break
+                    except Exception:
                         continue
-                    
-                    x, y = coords
-                    x, y = snap_to_grid(x), snap_to_grid(y)
-                    
-                    # Debug: check if Symbol.from_lib is actually callable
-                    if not callable(Symbol.from_lib):
-                        raise RuntimeError(f"Symbol.from_lib exists but is not callable: {type(Symbol.from_lib)}")
-                    
-                    # Use the from_lib API with proper parameters
-                    # Signature: from_lib(schematic, lib_id: str, reference: str, at_x: float, at_y: float, ...)
-                    sym = Symbol.from_lib(
-                        doc,
-                        lib_id=op.symbol,
-                        reference=op.ref,
-                        at_x=x,
-                        at_y=y,
-                        unit=1,
-                        in_bom=True,
-                        on_board=True,
-                        dnp=False
-                    )  # type: ignore[attr-defined]
-                    
-                    # Set value if provided (direct assignment now supported in fork)
-                    if op.value:
-                        sym.Value = op.value
-                    
-                    # Rotation (best-effort)
-                    if getattr(op, "rot", 0):
-                        for attr in ("rotation", "rot"):
-                            try:
-                                setattr(sym, attr, op.rot)
-                                break
-                            except Exception:
-                                continue
-                    
-                    # Additional fields are best-effort, ignore failures
-                    for k, v in getattr(op, "fields", {}).items():
-                        try:
-                            setattr(sym, k, v)
-                        except Exception:
-                            pass
-                    
-                    # Symbol is automatically added to doc.symbol by from_lib
-                    affected_refs.append(op.ref)
-                    components_added = True  # Mark that we need to rebuild indexes
-                    diagnostics.append(
-                        Diagnostic(stage="writer", severity="info", ref=op.ref, message=f"Added {op.ref} ({op.symbol})")
-                    )
-                else:
-                    # Symbol.from_lib not available in this skip version
-                    raise RuntimeError(
-                        "Symbol.from_lib is not available in kicad-skip 0.2.5. "
-                        "Adding components programmatically is not supported with the current version of kicad-skip. "
-                        "You can: (1) manually add components in KiCad first, then use kAIcad for wiring/labels, "
-                        "or (2) wait for kicad-skip library updates with symbol creation support."
-                    )
-            except Exception as e:
-                import traceback
-                error_msg = str(e)
-                # Include traceback for debugging
-                tb_lines = traceback.format_exc().split('\n')
-                # Find the actual error line
-                for line in tb_lines:
-                    if 'File' in line and 'writer.py' in line:
-                        error_msg += f" | {line.strip()}"
-                
-                suggestion = "This environment does not support creating symbols programmatically with kicad-skip."
-                
-                # Provide more specific suggestions based on the error
-                if "from_lib" in error_msg:
-                    suggestion = (
-                        "Component creation is not supported in kicad-skip 0.2.5. "
-                        "Workaround: Add components manually in KiCad first, then use kAIcad for connections and labels only. "
-                        "Or use a schematic that already has the needed components and ask to wire/connect them."
-                    )
-                
-                diagnostics.append(
-                    Diagnostic(
-                        stage="writer",
-                        severity="error",
-                        ref=op.ref,
-                        message=f"Failed to add component: {error_msg}",
-                        suggestion=suggestion,
-                    )
-                )
-        elif op.op == "wire":
-            # Rebuild indexes if components were added (symbols now in doc.symbol immediately)
-            if components_added:
-                ref_index = build_ref_index(doc)
-                pin_index = build_pin_index(ref_index)
-                components_added = False
             
-            # Wire between pins identified as REF:PIN using indexed lookups
-            try:
-                # Validate wire format with security checks
-                from_valid, from_error, from_parts = validate_wire_format(op.from_)
-                if not from_valid:
-                    diagnostics.append(
-                        Diagnostic(
-                            stage="writer",
-                            severity="error",
-                            message=f"Invalid 'from' wire format: {from_error}",
-                            suggestion="Use format 'REF:PIN' (e.g., 'R1:1')",
-                        )
-                    )
-                    continue
-                
-                to_valid, to_error, to_parts = validate_wire_format(op.to)
-                if not to_valid:
-                    diagnostics.append(
-                        Diagnostic(
-                            stage="writer",
-                            severity="error",
-                            message=f"Invalid 'to' wire format: {to_error}",
-                            suggestion="Use format 'REF:PIN' (e.g., 'R1:2')",
-                        )
-                    )
-                    continue
-                
-                from_ref, from_pin = from_parts
-                to_ref, to_pin = to_parts
-
-                # O(1) pin coordinate lookups with validation
+            # Additional fields are best-effort, ignore failures
+            for k, v in getattr(op, "fields", {}).items():
                 try:
-                    from_pos = lookup_pin_coords(from_ref, from_pin, ref_index, pin_index, diagnostics)
-                except Exception as lookup_err:
-                    diagnostics.append(
-                        Diagnostic(
-                            stage="writer",
-                            severity="error",
-                            ref=from_ref,
-                            message=f"Pin lookup failed for {from_ref}:{from_pin}: {lookup_err}",
-                        )
-                    )
-                    from_pos = None
-                
-                try:
-                    to_pos = lookup_pin_coords(to_ref, to_pin, ref_index, pin_index, diagnostics)
-                except Exception as lookup_err:
-                    diagnostics.append(
-                        Diagnostic(
-                            stage="writer",
-                            severity="error",
-                            ref=to_ref,
-                            message=f"Pin lookup failed for {to_ref}:{to_pin}: {lookup_err}",
-                        )
-                    )
-                    to_pos = None
+                    setattr(sym, k, v)
+                except Exception:
+                    pass
+            
+            # Symbol is automatically added to doc.symbol by from_lib
+            affected_refs.append(op.ref)
+            ctx.components_added = True  # Mark that we need to rebuild indexes
+            diagnostics.append(
+                Diagnostic(stage="writer", severity="info", ref=op.ref, message=f"Added {op.ref} ({op.symbol})")
+            )
+        else:
+            # Symbol.from_lib not available in this skip version
+            raise RuntimeError(
+                "Symbol.from_lib is not available in kicad-skip 0.2.5. "
+                "Adding components programmatically is not supported with the current version of kicad-skip. "
+                "You can: (1) manually add components in KiCad first, then use kAIcad for wiring/labels, "
+                "or (2) wait for kicad-skip library updates with symbol creation support."
+            )
+    except Exception as e:
+        import traceback
+        error_msg = str(e)
+        # Include traceback for debugging
+        tb_lines = traceback.format_exc().split('\n')
+        # Find the actual error line
+        for line in tb_lines:
+            if 'File' in line and 'writer.py' in line:
+                error_msg += f" | {line.strip()}"
+        
+        suggestion = "This environment does not support creating symbols programmatically with kicad-skip."
+        
+        # Provide more specific suggestions based on the error
+        if "from_lib" in error_msg:
+            suggestion = (
+                "Component creation is not supported in kicad-skip 0.2.5. "
+                "Workaround: Add components manually in KiCad first, then use kAIcad for connections and labels only. "
+                "Or use a schematic that already has the needed components and ask to wire/connect them."
+            )
+        
+        diagnostics.append(
+            Diagnostic(
+                stage="writer",
+                severity="error",
+                ref=op.ref,
+                message=f"Failed to add component: {error_msg}",
+                suggestion=suggestion,
+            )
+        )
 
-                if from_pos and to_pos:
-                    # Both pins found with coordinates - create wire using collection API
-                    try:
-                        if not hasattr(doc, 'wire') or doc.wire is None:
-                            diagnostics.append(
-                                Diagnostic(
-                                    stage="writer",
-                                    severity="error",
-                                    ref=from_ref,
-                                    message="Wire collection not available in schematic",
-                                    suggestion="This schematic may not support wire operations",
-                                )
-                            )
-                            continue
-                        
-                        w = doc.wire.new()
-                        # kicad-skip wire wrapper exposes 'pts' list property
-                        w.pts = [from_pos, to_pos]
-                        doc.wire.append(w)
-                        affected_refs.extend([from_ref, to_ref])
-                        diagnostics.append(
-                            Diagnostic(
-                                stage="writer",
-                                severity="info",
-                                ref=from_ref,
-                                message=f"Connected wire from {from_ref}:{from_pin} to {to_ref}:{to_pin}",
-                            )
-                        )
-                    except Exception as wire_err:
-                        import traceback
-                        tb = traceback.format_exc()
-                        diagnostics.append(
-                            Diagnostic(
-                                stage="writer",
-                                severity="error",
-                                ref=from_ref,
-                                message=f"Wire placement failed: {wire_err}\n{tb}",
-                            )
-                        )
-                # If pins not found, lookup_pin_coords already added diagnostics explaining why
 
-            except Exception as e:
-                diagnostics.append(
-                    Diagnostic(
-                        stage="writer",
-                        severity="error",
-                        message=f"Wire operation failed: {e}",
-                        suggestion="Verify wire format is 'REF:PIN' (e.g., 'R1:1')",
-                    )
+def _apply_wire(ctx: _ApplyContext, op: Wire) -> None:
+    """Draw a wire between two REF:PIN endpoints."""
+    doc = ctx.doc
+    diagnostics = ctx.diagnostics
+    affected_refs = ctx.affected_refs
+
+    # Rebuild indexes if components were added (symbols now in doc.symbol immediately)
+    if ctx.components_added:
+        ctx.ref_index = build_ref_index(doc)
+        ctx.pin_index = build_pin_index(ctx.ref_index)
+        ctx.components_added = False
+    
+    # Wire between pins identified as REF:PIN using indexed lookups
+    try:
+        # Validate wire format with security checks
+        from_valid, from_error, from_parts = validate_wire_format(op.from_)
+        if not from_valid:
+            diagnostics.append(
+                Diagnostic(
+                    stage="writer",
+                    severity="error",
+                    message=f"Invalid 'from' wire format: {from_error}",
+                    suggestion="Use format 'REF:PIN' (e.g., 'R1:1')",
+                )
+            )
+            return
+        
+        to_valid, to_error, to_parts = validate_wire_format(op.to)
+        if not to_valid:
+            diagnostics.append(
+                Diagnostic(
+                    stage="writer",
+                    severity="error",
+                    message=f"Invalid 'to' wire format: {to_error}",
+                    suggestion="Use format 'REF:PIN' (e.g., 'R1:2')",
+                )
+            )
+            return
+        
+        from_ref, from_pin = from_parts
+        to_ref, to_pin = to_parts
+
+        # O(1) pin coordinate lookups with validation
+        try:
+            from_pos = lookup_pin_coords(from_ref, from_pin, ctx.ref_index, ctx.pin_index, diagnostics)
+        except Exception as lookup_err:
+            diagnostics.append(
+                Diagnostic(
+                    stage="writer",
+                    severity="error",
+                    ref=from_ref,
+                    message=f"Pin lookup failed for {from_ref}:{from_pin}: {lookup_err}",
+                )
+            )
+            from_pos = None
+        
+        try:
+            to_pos = lookup_pin_coords(to_ref, to_pin, ctx.ref_index, ctx.pin_index, diagnostics)
+        except Exception as lookup_err:
+            diagnostics.append(
+                Diagnostic(
+                    stage="writer",
+                    severity="error",
+                    ref=to_ref,
+                    message=f"Pin lookup failed for {to_ref}:{to_pin}: {lookup_err}",
                 )
-        elif op.op == "label":
+            )
+            to_pos = None
+
+        if from_pos and to_pos:
+            # Both pins found with coordinates - create wire using collection API
             try:
-                # Validate and snap label position to grid
-                coord_valid, coord_error, coords = validate_coordinate(op.at)
-                if not coord_valid:
+                if not hasattr(doc, 'wire') or doc.wire is None:
                     diagnostics.append(
                         Diagnostic(
                             stage="writer",
                             severity="error",
-                            message=f"Invalid label coordinate: {coord_error}",
-                            suggestion="Use [x, y] format with numeric values",
+                            ref=from_ref,
+                            message="Wire collection not available in schematic",
+                            suggestion="This schematic may not support wire operations",
                         )
                     )
-                    continue
+                    return
                 
-                x, y = coords
-                x, y = snap_to_grid(x), snap_to_grid(y)
-                lab = doc.label.new()
-                lab.value = op.net
-                lab.at = x, y
-                doc.label.append(lab)
+                w = doc.wire.new()
+                # kicad-skip wire wrapper exposes 'pts' list property
+                w.pts = [from_pos, to_pos]
+                doc.wire.append(w)
+                affected_refs.extend([from_ref, to_ref])
                 diagnostics.append(
-                    Diagnostic(stage="writer", severity="info", message=f"Added label '{op.net}' at ({x}, {y})")
+                    Diagnostic(
+                        stage="writer",
+                        severity="info",
+                        ref=from_ref,
+                        message=f"Connected wire from {from_ref}:{from_pin} to {to_ref}:{to_pin}",
+                    )
                 )
-            except Exception as e:
+            except Exception as wire_err:
+                import traceback
+                tb = traceback.format_exc()
                 diagnostics.append(
                     Diagnostic(
                         stage="writer",
                         severity="error",
-                        message=f"Label operation failed: {e}",
-                        suggestion="Check label position and net name validity",
+                        ref=from_ref,
+                        message=f"Wire placement failed: {wire_err}\n{tb}",
                     )
                 )
+        # If pins not found, lookup_pin_coords already added diagnostics explaining why
+
+    except Exception as e:
+        diagnostics.append(
+            Diagnostic(
+                stage="writer",
+                severity="error",
+                message=f"Wire operation failed: {e}",
+                suggestion="Verify wire format is 'REF:PIN' (e.g., 'R1:1')",
+            )
+        )
+
+
+def _apply_label(ctx: _ApplyContext, op: Label) -> None:
+    """Place a net label."""
+    doc = ctx.doc
+    diagnostics = ctx.diagnostics
+
+    try:
+        # Validate and snap label position to grid
+        coord_valid, coord_error, coords = validate_coordinate(op.at)
+        if not coord_valid:
+            diagnostics.append(
+                Diagnostic(
+                    stage="writer",
+                    severity="error",
+                    message=f"Invalid label coordinate: {coord_error}",
+                    suggestion="Use [x, y] format with numeric values",
+                )
+            )
+            return
+        
+        x, y = snap_values(coords)
+        lab = doc.label.new()
+        lab.value = op.net
+        lab.at = x, y
+        doc.label.append(lab)
+        diagnostics.append(
+            Diagnostic(stage="writer", severity="info", message=f"Added label '{op.net}' at ({x}, {y})")
+        )
+    except Exception as e:
+        diagnostics.append(
+            Diagnostic(
+                stage="writer",
+                severity="error",
+                message=f"Label operation failed: {e}",
+                suggestion="Check label position and net name validity",
+            )
+        )
+
+
+# Dispatch table keyed on each op's literal tag
+_OP_HANDLERS: Dict[str, Callable[[_ApplyContext, Any], None]] = {
+    "add_component": _apply_add_component,
+    "wire": _apply_wire,
+    "label": _apply_label,
+}
+
+
+def apply_plan(doc: Schematic, plan: Plan) -> ApplyResult:
+    """
+    Apply a plan to a schematic document.
+
+    Coordinates are snapped to GRID_MM (2.54mm) for deterministic placement.
+    Wire operations use get_pin_locations() for all component types.
+
+    Returns an ApplyResult with diagnostics instead of printing to console.
+    """
+    diagnostics = []
+    affected_refs = []
+
+    # GATE: Enforce schema version before any operations
+    if plan.plan_version != PLAN_SCHEMA_VERSION:
+        diagnostics.append(
+            Diagnostic(
+                stage="validator",
+                severity="error",
+                message=f"Plan schema version mismatch: plan has v{plan.plan_version}, writer expects v{PLAN_SCHEMA_VERSION}",
+                suggestion=f"Re-run the planner to generate a v{PLAN_SCHEMA_VERSION} plan, or run a schema migrator if available",
+            )
+        )
+        return ApplyResult(success=False, diagnostics=diagnostics, affected_refs=[])
+
+    # Build indexes once for O(1) lookups during operations
+    ref_index = build_ref_index(doc)
+    ctx = _ApplyContext(
+        doc=doc,
+        diagnostics=diagnostics,
+        affected_refs=affected_refs,
+        ref_index=ref_index,
+        pin_index=build_pin_index(ref_index),
+    )
+
+    for op in plan.ops:
+        handler = _OP_HANDLERS.get(op.op)
+        if handler is None:
+            diagnostics.append(Diagnostic(stage="writer", severity="error", message=f"Unsupported operation '{op.op}'"))
+            continue
+        handler(ctx, op)
 
     # Return result with diagnostics
     return ApplyResult(
@@ -498,6 +566,7 @@ __all__ = [
     "Symbol",
     "GRID_MM",
     "snap_to_grid",
+    "snap_values",
     "get_symbol_ref",
     "get_pin_locations_compat",
     "apply_plan",
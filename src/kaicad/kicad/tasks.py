@@ -1,6 +1,7 @@
 import logging
 import subprocess
 from pathlib import Path
+from typing import List
 
 from kaicad.kicad.version import check_kicad_cli
 
@@ -36,14 +37,7 @@ def run_erc(sch: Path) -> subprocess.CompletedProcess:
         FileNotFoundError: If kicad-cli is not found in PATH
     """
     _ensure_kicad_cli_available()
-    out = sch.with_suffix(".erc.txt")
-    logger.info(f"Running ERC on {sch}")
-    return subprocess.run(
-        ["kicad-cli", "sch", "erc", str(sch), "-o", str(out), "--format", "report"],
-        check=True,  # Raise CalledProcessError on failure
-        capture_output=True,
-        text=True
-    )
+    return _run_erc(sch)
 
 
 def export_netlist(sch: Path) -> subprocess.CompletedProcess:
@@ -61,14 +55,7 @@ def export_netlist(sch: Path) -> subprocess.CompletedProcess:
         FileNotFoundError: If kicad-cli is not found in PATH
     """
     _ensure_kicad_cli_available()
-    out = sch.with_suffix(".net")
-    logger.info(f"Exporting netlist from {sch}")
-    return subprocess.run(
-        ["kicad-cli", "sch", "export", "netlist", str(sch), "-o", str(out)],
-        check=True,
-        capture_output=True,
-        text=True
-    )
+    return _export_netlist(sch)
 
 
 def export_pdf(sch: Path) -> subprocess.CompletedProcess:
@@ -86,6 +73,53 @@ def export_pdf(sch: Path) -> subprocess.CompletedProcess:
         FileNotFoundError: If kicad-cli is not found in PATH
     """
     _ensure_kicad_cli_available()
+    return _export_pdf(sch)
+
+
+def run_post_apply_tasks(sch: Path) -> List[subprocess.CompletedProcess]:
+    """
+    Run ERC, netlist export and PDF export on a schematic.
+    
+    kicad-cli availability is probed once for the whole batch instead of
+    once per command, saving a process spawn for every task.
+    
+    Args:
+        sch: Path to .kicad_sch file
+        
+    Returns:
+        CompletedProcess for ERC, netlist and PDF, in that order
+        
+    Raises:
+        CalledProcessError: If any kicad-cli call returns non-zero exit code
+        FileNotFoundError: If kicad-cli is not found in PATH
+    """
+    _ensure_kicad_cli_available()
+    return [_run_erc(sch), _export_netlist(sch), _export_pdf(sch)]
+
+
+def _run_erc(sch: Path) -> subprocess.CompletedProcess:
+    out = sch.with_suffix(".erc.txt")
+    logger.info(f"Running ERC on {sch}")
+    return subprocess.run(
+        ["kicad-cli", "sch", "erc", str(sch), "-o", str(out), "--format", "report"],
+        check=True,  # Raise CalledProcessError on failure
+        capture_output=True,
+        text=True
+    )
+
+
+def _export_netlist(sch: Path) -> subprocess.CompletedProcess:
+    out = sch.with_suffix(".net")
+    logger.info(f"Exporting netlist from {sch}")
+    return subprocess.run(
+        ["kicad-cli", "sch", "export", "netlist", str(sch), "-o", str(out)],
+        check=True,
+        capture_output=True,
+        text=True
+    )
+
+
+def _export_pdf(sch: Path) -> subprocess.CompletedProcess:
     out = sch.with_suffix(".pdf")
     logger.info(f"Exporting PDF from {sch}")
     return subprocess.run(
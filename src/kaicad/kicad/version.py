@@ -4,21 +4,28 @@ from __future__ import annotations
 
 import logging
 import subprocess
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Seconds a kicad-cli probe result is reused before the process is spawned again
+KICAD_CLI_CHECK_TTL = 30.0
 
-@dataclass
+# (monotonic timestamp, result) of the last kicad-cli probe
+_cli_check_cache: Optional[Tuple[float, Tuple[bool, str]]] = None
+
+
+@dataclass(frozen=True, slots=True, order=True)
 class KiCadVersion:
-    """Represents a KiCad version."""
+    """Represents a KiCad version; compared and ordered by (major, minor, patch)."""
 
     major: int
     minor: int
     patch: int
-    raw: str
+    raw: str = field(compare=False)
 
     def __str__(self) -> str:
         return f"{self.major}.{self.minor}.{self.patch}"
@@ -32,9 +39,30 @@ class KiCadVersion:
 def check_kicad_cli() -> Tuple[bool, str]:
     """Check if kicad-cli is available and get version.
 
+    The result is reused for KICAD_CLI_CHECK_TTL seconds so repeated checks
+    don't each spawn a process; clear_kicad_cli_cache() forces a new probe.
+
     Returns:
         Tuple of (is_available, version_or_error_message)
     """
+    global _cli_check_cache
+    now = time.monotonic()
+    if _cli_check_cache is not None and now - _cli_check_cache[0] < KICAD_CLI_CHECK_TTL:
+        return _cli_check_cache[1]
+
+    result = _probe_kicad_cli()
+    _cli_check_cache = (now, result)
+    return result
+
+
+def clear_kicad_cli_cache() -> None:
+    """Forget the last kicad-cli probe result."""
+    global _cli_check_cache
+    _cli_check_cache = None
+
+
+def _probe_kicad_cli() -> Tuple[bool, str]:
+    """Run 'kicad-cli --version' and report availability."""
     try:
         result = subprocess.run(
             ["kicad-cli", "--version"],
@@ -158,6 +186,7 @@ def _get_version_warnings(version: Optional[KiCadVersion]) -> list[str]:
 __all__ = [
     "KiCadVersion",
     "check_kicad_cli",
+    "clear_kicad_cli_cache",
     "get_kicad_version",
     "parse_kicad_version",
     "check_kicad_tools",
@@ -1,4 +1,4 @@
-from typing import Dict, List, Literal, Optional, Tuple, Union
+from typing import Annotated, Dict, List, Literal, Optional, Tuple, Union
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -10,8 +10,11 @@ class Diagnostic(BaseModel):
     """
     Structured diagnostic message for errors, warnings, and info.
     Used to surface issues from planner/writer stages to UIs.
+    Immutable once created, so instances can be hashed and shared freely.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     stage: Literal["planner", "writer", "validator", "web"] = Field(
         ..., description="Stage where diagnostic was generated"
     )
@@ -38,6 +41,10 @@ class PlanResult(BaseModel):
         """Check if any diagnostics are warnings"""
         return any(d.severity == "warning" for d in self.diagnostics)
 
+    def first_diagnostic(self, severity: str) -> Optional[Diagnostic]:
+        """Return the first diagnostic with the given severity, or None"""
+        return next((d for d in self.diagnostics if d.severity == severity), None)
+
 
 class ApplyResult(BaseModel):
     """
@@ -56,6 +63,10 @@ class ApplyResult(BaseModel):
         """Check if any diagnostics are warnings"""
         return any(d.severity == "warning" for d in self.diagnostics)
 
+    def first_diagnostic(self, severity: str) -> Optional[Diagnostic]:
+        """Return the first diagnostic with the given severity, or None"""
+        return next((d for d in self.diagnostics if d.severity == severity), None)
+
 
 class AddComponent(BaseModel):
     op: Literal["add_component"]
@@ -82,7 +93,8 @@ class Label(BaseModel):
     at: Tuple[float, float] = Field(..., description="Position in mm, will snap to grid")
 
 
-Op = Union[AddComponent, Wire, Label]
+# Tagged on "op" so validation dispatches straight to the matching model
+Op = Annotated[Union[AddComponent, Wire, Label], Field(discriminator="op")]
 
 
 class Plan(BaseModel):
@@ -99,6 +111,26 @@ class Plan(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
+def dumps_plan(plan: Plan, indent: Optional[int] = None) -> str:
+    """
+    Serialize a plan to JSON using field aliases (e.g. wires use "from").
+
+    Serialization runs entirely in pydantic-core, skipping the intermediate
+    dict that model_dump() + json.dumps() would build.
+    """
+    return plan.model_dump_json(by_alias=True, indent=indent)
+
+
+def loads_plan(text: str | bytes) -> Plan:
+    """
+    Parse and validate a plan from JSON text; the preferred way to load plans.
+
+    Parsing and validation both run in pydantic-core, so no intermediate
+    dict is built by json.loads(). Malformed JSON raises ValidationError.
+    """
+    return Plan.model_validate_json(text)
+
+
 # Public API
 __all__ = [
     "PLAN_SCHEMA_VERSION",
@@ -109,4 +141,6 @@ __all__ = [
     "Wire",
     "Label",
     "Plan",
+    "dumps_plan",
+    "loads_plan",
 ]
@@ -1,4 +1,4 @@
-import json
+import argparse
 import sys
 import time
 from pathlib import Path
@@ -9,8 +9,8 @@ from rich.table import Table
 from skip.eeschema import schematic as sch  # type: ignore
 
 from kaicad.core.planner import plan_from_prompt
-from kaicad.schema.plan import Plan
-from kaicad.kicad.tasks import export_netlist, export_pdf, run_erc
+from kaicad.schema.plan import Plan, dumps_plan
+from kaicad.kicad.tasks import run_erc, run_post_apply_tasks
 from kaicad.core.writer import apply_plan
 
 try:
@@ -69,19 +69,20 @@ def apply_and_validate(sch_path: Path, plan: Plan, dry_run: bool = False):
     doc.to_file(str(sch_path))
 
     console.print(f"[green]Applied plan successfully. Modified refs: {', '.join(result.affected_refs)}[/green]")
-    run_erc(sch_path)
-    export_netlist(sch_path)
-    export_pdf(sch_path)
+    run_post_apply_tasks(sch_path)
 
 
-def main() -> None:
-    import argparse
-
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser for the kaicad console script"""
     parser = argparse.ArgumentParser(description="kAIcad CLI - AI-powered KiCad schematic editor")
     parser.add_argument("--project", type=str, help="Project folder containing .kicad_sch file")
     parser.add_argument("--dry-run", action="store_true", help="Show plan without applying changes")
     parser.add_argument("--prompt", type=str, help="Direct prompt for plan generation (non-interactive)")
-    args = parser.parse_args()
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
 
     # Determine project folder
     if args.project:
@@ -110,7 +111,7 @@ def main() -> None:
             sys.exit(1)
 
         console.print("\n[bold]Generated Plan:[/bold]")
-        console.print(json.dumps(plan_result.plan.model_dump(by_alias=True), indent=2))
+        console.print(dumps_plan(plan_result.plan, indent=2))
 
         if not args.dry_run:
             if not Confirm.ask("Apply?", default=True):
@@ -138,7 +139,7 @@ def main() -> None:
                 continue
 
             # Show the plan
-            console.print(json.dumps(plan_result.plan.model_dump(by_alias=True), indent=2))
+            console.print(dumps_plan(plan_result.plan, indent=2))
             if Confirm.ask("Apply?"):
                 apply_and_validate(sch_path, plan_result.plan, dry_run=args.dry_run)
         elif cmd == "f":
@@ -1,4 +1,3 @@
-import json
 import os
 import threading
 from pathlib import Path
@@ -18,9 +17,9 @@ from skip.eeschema import schematic as sch  # type: ignore
 
 from kaicad.core.planner import plan_from_prompt
 from kaicad.core.model_registry import ModelRegistry
-from kaicad.schema.plan import Plan
+from kaicad.schema.plan import dumps_plan, loads_plan
 from kaicad.config.settings import Settings
-from kaicad.kicad.tasks import export_netlist, export_pdf, run_erc
+from kaicad.kicad.tasks import run_erc, run_post_apply_tasks
 from kaicad.core.writer import apply_plan
 
 
@@ -175,7 +174,7 @@ class SidecarApp:
                             msg += f" → {d.suggestion}"
                         self.root.after(0, lambda m=msg: self.logln(m))
 
-                self.root.after(0, lambda: self.plan_text_replace(json.dumps(plan_result.plan.model_dump(), indent=2)))
+                self.root.after(0, lambda: self.plan_text_replace(dumps_plan(plan_result.plan, indent=2)))
                 self.root.after(0, lambda: self.logln("Plan generated."))
             except Exception as e:
                 error_msg = str(e)  # Capture error message before lambda
@@ -194,8 +193,7 @@ class SidecarApp:
             messagebox.showwarning("kAIcad", "No schematic detected. Choose a project folder with a .kicad_sch.")
             return
         try:
-            data = json.loads(self.plan_text.get("1.0", tk.END))
-            plan = Plan.model_validate(data)
+            plan = loads_plan(self.plan_text.get("1.0", tk.END))
         except Exception as e:
             messagebox.showerror("kAIcad", f"Invalid plan JSON: {e}")
             return
@@ -229,9 +227,7 @@ class SidecarApp:
                 doc.to_file(str(self.sch_path))
                 self.root.after(0, lambda: self.logln(f"Applied plan. Modified: {', '.join(result.affected_refs)}"))
                 self.root.after(0, lambda: self.logln("Running ERC/Netlist/PDF..."))
-                run_erc(self.sch_path)
-                export_netlist(self.sch_path)
-                export_pdf(self.sch_path)
+                run_post_apply_tasks(self.sch_path)
                 self.root.after(0, lambda: self.logln("Done. ERC report, netlist, and PDF generated."))
             except Exception as e:
                 error_msg = str(e)
@@ -1,5 +1,5 @@
 """Flask web interface."""
 
-from .app import *
+from .app import create_app, main
 
-__all__ = ["app"]
+__all__ = ["create_app", "main"]
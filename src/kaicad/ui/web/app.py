@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import argparse
 import json
 import logging
 import os
@@ -9,7 +10,7 @@ from pathlib import Path
 from typing import List, Optional
 
 from dotenv import load_dotenv
-from flask import Flask, flash, jsonify, render_template, request
+from flask import Blueprint, Flask, flash, jsonify, render_template, request
 
 # Import from kaicad package
 from kaicad.core.inspector import (
@@ -26,8 +27,8 @@ from kaicad.core.models import get_default_model, get_real_model_name, is_model_
 from kaicad.core.model_registry import ModelRegistry
 from kaicad.core.planner import plan_from_prompt
 from kaicad.config.settings import Settings
-from kaicad.schema.plan import Plan
-from kaicad.kicad.tasks import export_netlist, export_pdf, run_erc
+from kaicad.schema.plan import Plan, dumps_plan, loads_plan
+from kaicad.kicad.tasks import run_post_apply_tasks
 from kaicad.core.writer import apply_plan
 from kaicad.utils.validation import validate_project_path, validate_model_name, validate_prompt
 from kaicad.utils.constants import MAX_RECENT_PROJECTS, ATTACHMENT_PREVIEW_LENGTH, MAX_DISPLAYED_SYMBOLS, MAX_DISPLAYED_NETS, MAX_DISPLAYED_CONNECTIONS
@@ -44,16 +45,16 @@ template_folder = Path(__file__).parent / "templates"
 # Project root for state storage files
 project_root = Path.cwd()
 
-app = Flask(__name__, template_folder=str(template_folder))
+# Routes are registered on a blueprint; create_app() builds and configures the Flask app
+bp = Blueprint("web", __name__)
 
-# Initialize rate limiter for cost protection
+# Initialize rate limiter for cost protection (bound to each app in create_app())
 limiter = None
 try:
     from flask_limiter import Limiter
     from flask_limiter.util import get_remote_address
 
     limiter = Limiter(
-        app=app,
         key_func=get_remote_address,
         default_limits=["200 per day", "50 per hour"],
         storage_uri="memory://",
@@ -71,10 +72,6 @@ try:
 except ImportError:
     logger.warning("flask-wtf not installed. CSRF protection disabled.")
 
-# Track if app has been configured
-_app_configured = False
-
-
 def _apply_rate_limit(limit_string: str):
     """Helper to conditionally apply rate limiting decorator.
     
@@ -93,12 +90,6 @@ def _apply_rate_limit(limit_string: str):
 
 # Security configuration is deferred to create_app() to avoid import-time failures
 def _configure_security(app: Flask) -> None:
-    global _app_configured
-
-    # Only configure once
-    if _app_configured:
-        return
-
     secret_key = os.getenv("FLASK_SECRET_KEY")
     flask_env = os.getenv("FLASK_ENV", "production")
     if not secret_key or secret_key == "dev-secret":
@@ -129,15 +120,10 @@ def _configure_security(app: Flask) -> None:
         def inject_csrf_token():
             return dict(csrf_token=lambda: "")
 
-    # Initialize CSRF protection with app (only once)
+    # Initialize CSRF protection with app
     if csrf is not None and flask_env != "development":
         csrf.init_app(app)
 
-    _app_configured = True
-
-
-# Configure app at module import time (tests set FLASK_ENV before importing)
-_configure_security(app)
 
 # State storage files (separated by concern)
 RECENT_PROJECTS_FILE = project_root / ".recent_projects.json"
@@ -147,27 +133,50 @@ PLAN_HISTORY_FILE = project_root / ".plan_history.json"
 CURRENT_PROJECT_FILE = project_root / ".current_project.json"
 
 
+# ((file, mtime_ns, size), project_path) from the last read or write of CURRENT_PROJECT_FILE
+_current_project_cache: Optional[tuple] = None
+
+
+def _current_project_key() -> Optional[tuple]:
+    """Identify the current project file's contents by path, mtime and size (None if missing)"""
+    try:
+        st = CURRENT_PROJECT_FILE.stat()
+    except OSError:
+        return None
+    return (CURRENT_PROJECT_FILE, st.st_mtime_ns, st.st_size)
+
+
 def _load_current_project() -> Optional[str]:
-    """Load the currently active project path"""
-    if CURRENT_PROJECT_FILE.exists():
+    """Load the currently active project path, re-reading the file only after it changes"""
+    global _current_project_cache
+    key = _current_project_key()
+    if key is not None:
+        if _current_project_cache is not None and _current_project_cache[0] == key:
+            return _current_project_cache[1]
         try:
             data = json.loads(CURRENT_PROJECT_FILE.read_text(encoding="utf-8"))
-            return data.get("project_path")
+            project_path = data.get("project_path")
         except Exception as e:
             logger.error(f"Failed to load current project: {e}")
+        else:
+            _current_project_cache = (key, project_path)
+            return project_path
     return os.getenv("KAICAD_PROJECT", "")
 
 
-def _save_current_project(project_path: str) -> None:
-    """Save the currently active project path"""
+def _save_current_project(project_path: str) -> Optional[dict]:
+    """Save the currently active project path, returning the saved data (None on failure)"""
+    global _current_project_cache
+    data = {"project_path": project_path}
     try:
-        CURRENT_PROJECT_FILE.write_text(
-            json.dumps({"project_path": project_path}, indent=2),
-            encoding="utf-8"
-        )
+        CURRENT_PROJECT_FILE.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        # Prime the cache from the write so the next load needs no read
+        _current_project_cache = (_current_project_key(), project_path)
         os.environ["KAICAD_PROJECT"] = project_path
     except Exception as e:
         logger.error(f"Failed to save current project: {e}")
+        return None
+    return data
 
 
 def _load_chat_history() -> List[dict]:
@@ -321,7 +330,7 @@ def _discover_schematic(proj: Path) -> Optional[Path]:
         return None
 
 
-@app.route("/debug_schematic", methods=["GET"])
+@bp.route("/debug_schematic", methods=["GET"])
 def debug_schematic() -> tuple:
     """Debug endpoint to check schematic loading status"""
     try:
@@ -369,7 +378,7 @@ def debug_schematic() -> tuple:
         return jsonify({"error": str(e)})
 
 
-@app.route("/generate_description", methods=["POST"])
+@bp.route("/generate_description", methods=["POST"])
 @_apply_rate_limit("15 per minute")  # Protect from API credit burns
 def generate_description() -> tuple:
     """Use AI to generate or expand a plan description"""
@@ -443,7 +452,7 @@ Provide a clear, actionable description for implementing this in KiCad (2-3 sent
         return jsonify(response), status_code
 
 
-@app.route("/send_chat", methods=["POST"])
+@bp.route("/send_chat", methods=["POST"])
 @_apply_rate_limit("10 per minute")  # Protect from API credit burns
 def send_chat() -> tuple:
     """Handle chat messages via AJAX"""
@@ -799,7 +808,7 @@ Rules:
         return jsonify(response), status_code
 
 
-@app.route("/", methods=["GET", "POST"])
+@bp.route("/", methods=["GET", "POST"])
 def index() -> str:
     # Persist last used project folder in persistent file
     last_proj = _load_current_project()
@@ -1041,14 +1050,13 @@ Rules:
                         msg += f" → {d.suggestion}"
                     flash(msg, level)
 
-            plan_json = json.dumps(plan_result.plan.model_dump(by_alias=True), indent=2)
+            plan_json = dumps_plan(plan_result.plan, indent=2)
             # Save last project choice
             _save_current_project(str(proj))
         elif action == "apply":
             try:
                 plan_json_str = request.form.get("plan_json", "{}")
-                data = json.loads(plan_json_str)
-                plan_obj = Plan.model_validate(data)
+                plan_obj = loads_plan(plan_json_str)
             except Exception as e:
                 flash(f"Invalid plan JSON: {e}", "error")
                 return render_template(
@@ -1106,9 +1114,7 @@ Rules:
                 bak = sch_path.with_suffix(".kicad_sch.bak")
                 bak.write_text(original, encoding="utf-8")
                 doc.to_file(str(sch_path))
-                run_erc(sch_path)
-                export_netlist(sch_path)
-                export_pdf(sch_path)
+                run_post_apply_tasks(sch_path)
                 flash(f"Plan applied successfully. Modified: {', '.join(result.affected_refs)}", "success")
             except Exception as e:
                 flash(f"Apply failed: {e}", "error")
@@ -1131,27 +1137,36 @@ Rules:
 
 
 def create_app() -> Flask:
+    """Build a configured web app; raises RuntimeError without a usable secret outside development"""
+    app = Flask(__name__, template_folder=str(template_folder))
     _configure_security(app)
-    
+    if limiter is not None:
+        limiter.init_app(app)
+    app.register_blueprint(bp)
+
     # Register error handlers for secure error responses
     from kaicad.ui.web.errors import register_error_handlers
     register_error_handlers(app)
-    
+
     return app
 
 
-def main() -> None:
-    """Entry point for kaicad-web console script"""
-    import argparse
-
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser for the kaicad-web console script"""
     parser = argparse.ArgumentParser(description="kAIcad Web GUI")
     parser.add_argument("--serve", action="store_true", help="Production serve mode (requires secure secret)")
     parser.add_argument("--dev", action="store_true", help="Development mode (allows default secret)")
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
     parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "5173")), help="Port to bind to")
-    args = parser.parse_args()
+    return parser
+
+
+def main() -> None:
+    """Entry point for kaicad-web console script"""
+    args = build_parser().parse_args()
 
-    # Security check is now handled at app initialization
+    # Security check is handled when the app is created
+    app = create_app()
     if args.serve and not args.dev:
         logger.info(f"Starting in production mode on {args.host}:{args.port}")
         app.run(host=args.host, port=args.port, debug=False)
@@ -13,6 +13,7 @@ import logging
 from typing import Dict, Tuple
 
 from flask import Flask, jsonify
+from werkzeug.exceptions import HTTPException
 
 logger = logging.getLogger(__name__)
 
@@ -141,6 +142,10 @@ def register_error_handlers(app: Flask) -> None:
     @app.errorhandler(Exception)
     def handle_unexpected_error(e):
         """Catch-all handler for unexpected exceptions."""
+        # HTTP errors (e.g. 405 Method Not Allowed) keep their own status
+        if isinstance(e, HTTPException):
+            return e
+
         # Log full error with stack trace server-side only
         logger.error(f"Unexpected error: {e}", exc_info=True)
         
@@ -6,6 +6,7 @@ MAX_PROMPT_LENGTH = 10000
 MIN_API_KEY_LENGTH = 10
 MAX_API_KEY_LENGTH = 500
 MAX_FILENAME_LENGTH = 255
+MAX_COORD = 1000000.0  # KiCad practical coordinate limit
 
 # UI configuration
 MAX_RECENT_PROJECTS = 10
@@ -29,6 +30,7 @@ __all__ = [
     "MIN_API_KEY_LENGTH",
     "MAX_API_KEY_LENGTH",
     "MAX_FILENAME_LENGTH",
+    "MAX_COORD",
     "MAX_RECENT_PROJECTS",
     "ATTACHMENT_PREVIEW_LENGTH",
     "MAX_DISPLAYED_SYMBOLS",
@@ -2,6 +2,7 @@
 
 import math
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional, Tuple
 
@@ -9,12 +10,22 @@ from .constants import (
     ASCII_PRINTABLE_MAX,
     ASCII_PRINTABLE_MIN,
     MAX_API_KEY_LENGTH,
+    MAX_COORD,
     MAX_FILENAME_LENGTH,
     MAX_MODEL_NAME_LENGTH,
     MAX_PROMPT_LENGTH,
     MIN_API_KEY_LENGTH,
 )
 
+# Patterns compiled once at import; the validators run per op on the writer path
+_MODEL_NAME_RE = re.compile(r'^[a-zA-Z0-9._-]+$')
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[<>:"|?*\x00-\x1f]')
+_SYMBOL_RE = re.compile(r'^[a-zA-Z0-9_\-+. ]+:[a-zA-Z0-9_\-+. ]+$')
+# Conservative single-pass accept for symbols: each part starts with a non-space
+# character, no '..', no separators. Anything it rejects gets the detailed checks.
+_SYMBOL_OK_RE = re.compile(r'(?!.*\.\.)[a-zA-Z0-9_\-+.][a-zA-Z0-9_\-+. ]*:[a-zA-Z0-9_\-+.][a-zA-Z0-9_\-+. ]*\Z')
+_REF_RE = re.compile(r'^[A-Z]+[0-9]+$')
+
 
 def validate_project_path(path_str: str) -> Tuple[bool, str, Path | None]:
     """
@@ -80,7 +91,7 @@ def validate_model_name(model: str) -> Tuple[bool, str]:
     model = model.strip()
     
     # Must be alphanumeric with hyphens, dots, underscores
-    if not re.match(r'^[a-zA-Z0-9._-]+$', model):
+    if not _MODEL_NAME_RE.match(model):
         return False, "Invalid model name format"
     
     # Reasonable length limit
@@ -164,7 +175,7 @@ def sanitize_filename(filename: str) -> str:
     filename = Path(filename).name
     
     # Remove any remaining suspicious characters
-    filename = re.sub(r'[<>:"|?*\x00-\x1f]', '', filename)
+    filename = _UNSAFE_FILENAME_CHARS_RE.sub('', filename)
     
     # Limit length
     if len(filename) > MAX_FILENAME_LENGTH:
@@ -185,9 +196,12 @@ __all__ = [
 ]
 
 
+@lru_cache(maxsize=4096)
 def validate_symbol_name(symbol: str) -> Tuple[bool, Optional[str]]:
     """
     Validate KiCad symbol reference format to prevent injection attacks.
+
+    Results are cached per symbol string; schematics reuse a handful of symbols.
     
     Args:
         symbol: Symbol name in format 'Library:Name' (e.g., 'Device:R')
@@ -200,6 +214,10 @@ def validate_symbol_name(symbol: str) -> Tuple[bool, Optional[str]]:
         - Validates format matches KiCad conventions
         - Blocks path separators and suspicious characters
     """
+    # Fast path: well-formed symbols are accepted by one anchored match
+    if symbol and len(symbol) <= 200 and _SYMBOL_OK_RE.match(symbol):
+        return True, None
+
     if not symbol or not symbol.strip():
         return False, "Symbol name cannot be empty"
     
@@ -226,7 +244,7 @@ def validate_symbol_name(symbol: str) -> Tuple[bool, Optional[str]]:
     
     # Allow alphanumeric, dash, underscore, plus, dot (common in KiCad)
     # Also allow spaces for symbol names like "Device:LED RGB"
-    if not re.match(r'^[a-zA-Z0-9_\-+. ]+:[a-zA-Z0-9_\-+. ]+$', symbol):
+    if not _SYMBOL_RE.match(symbol):
         return False, "Symbol name contains invalid characters"
     
     # Check length limits
@@ -236,9 +254,12 @@ def validate_symbol_name(symbol: str) -> Tuple[bool, Optional[str]]:
     return True, None
 
 
+@lru_cache(maxsize=4096)
 def validate_wire_format(wire_spec: str) -> Tuple[bool, Optional[str], Optional[Tuple[str, str]]]:
     """
     Validate wire specification format 'REF:PIN'.
+
+    Results are cached per specification string.
     
     Args:
         wire_spec: Wire specification like 'R1:1' or 'U1:VCC'
@@ -246,6 +267,24 @@ def validate_wire_format(wire_spec: str) -> Tuple[bool, Optional[str], Optional[
     Returns:
         Tuple of (is_valid, error_message, (ref, pin) or None)
     """
+    # Fast path for the usual 'R1:1' / 'U5:VCC' shape using string methods only;
+    # anything unusual (whitespace, odd references) goes through the full checks
+    if wire_spec:
+        ref, sep, pin = wire_spec.partition(':')
+        letters = ref.rstrip("0123456789")
+        if (
+            sep
+            and letters
+            and len(letters) < len(ref)
+            and letters.isascii()
+            and letters.isalpha()
+            and letters.isupper()
+            and pin
+            and len(pin) <= 50
+            and pin.strip() == pin
+        ):
+            return True, None, (ref, pin)
+
     if not wire_spec or not wire_spec.strip():
         return False, "Wire specification cannot be empty", None
     
@@ -262,7 +301,7 @@ def validate_wire_format(wire_spec: str) -> Tuple[bool, Optional[str], Optional[
     if not ref.strip():
         return False, "Component reference cannot be empty", None
     
-    if not re.match(r'^[A-Z]+[0-9]+$', ref.strip()):
+    if not _REF_RE.match(ref.strip()):
         return False, f"Invalid component reference '{ref}' (expected format: R1, U5, C10)", None
     
     # Validate pin (can be number or name like VCC, GND, A, 1, 2)
@@ -285,6 +324,19 @@ def validate_coordinate(coord: Any) -> Tuple[bool, Optional[str], Optional[Tuple
     Returns:
         Tuple of (is_valid, error_message, (x, y) or None)
     """
+    # Fast path for the common case: a pair of plain ints/floats within bounds.
+    # The chained comparisons are False for NaN and infinities, so anything
+    # unusual falls through to the checks below for the exact error message.
+    if type(coord) in (list, tuple) and len(coord) == 2:
+        x, y = coord
+        if (
+            type(x) in (int, float)
+            and type(y) in (int, float)
+            and -MAX_COORD <= x <= MAX_COORD
+            and -MAX_COORD <= y <= MAX_COORD
+        ):
+            return True, None, (float(x), float(y))
+
     # Check if iterable
     if not isinstance(coord, (list, tuple)):
         return False, f"Coordinate must be [x, y], got {type(coord).__name__}", None
@@ -305,7 +357,6 @@ def validate_coordinate(coord: Any) -> Tuple[bool, Optional[str], Optional[Tuple
         return False, "Coordinate values must be finite numbers", None
     
     # Check bounds (KiCad practical limits)
-    MAX_COORD = 1000000.0
     if abs(x) > MAX_COORD or abs(y) > MAX_COORD:
         return False, f"Coordinate values exceed maximum {MAX_COORD}", None
     
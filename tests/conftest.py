@@ -0,0 +1,252 @@
+"""Shared pytest fixtures for the kAIcad test suite"""
+
+import pytest
+from pydantic import TypeAdapter
+
+from kaicad.config.settings import Settings, _keyring_api_key
+from kaicad.kicad.version import clear_kicad_cli_cache
+from kaicad.schema.plan import PLAN_SCHEMA_VERSION, AddComponent, Label, Plan, Wire
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-golden-cache",
+        action="store_true",
+        default=False,
+        help="Rebuild the applied golden schematic instead of reusing the copy in the pytest cache",
+    )
+    parser.addoption("--run-slow", action="store_true", default=False, help="Run tests marked slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test; pass --run-slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+_OP_MODELS = {"add_component": AddComponent, "wire": Wire, "label": Label}
+
+
+def _mk_plan(ops, plan_version=PLAN_SCHEMA_VERSION, **kw):
+    """Build a Plan from trusted op dicts without running validation.
+
+    Only for literals the test wrote as valid; field names (``from_``) and
+    Python types (tuples for ``at``) must be used since nothing is coerced.
+    """
+    built = [_OP_MODELS[op["op"]].model_construct(**op) for op in ops]
+    return Plan.model_construct(plan_version=plan_version, ops=built, **kw)
+
+
+# Valid plan dicts shared by the round-trip tests, validated once per session
+PLAN_CORPUS = {
+    "basic": {
+        "plan_version": PLAN_SCHEMA_VERSION,
+        "ops": [{"op": "add_component", "ref": "R1", "symbol": "Device:R", "value": "1k", "at": [100, 100], "rot": 0}],
+    },
+    "complex": {
+        "plan_version": PLAN_SCHEMA_VERSION,
+        "ops": [
+            {"op": "add_component", "ref": "R1", "symbol": "Device:R", "value": "10k", "at": [80, 50], "rot": 0},
+            {"op": "add_component", "ref": "D1", "symbol": "Device:LED", "value": "RED", "at": [120, 50], "rot": 90},
+            {"op": "wire", "from": "R1:2", "to": "D1:A"},
+            {"op": "label", "net": "LED_CATHODE", "at": [120, 46]},
+        ],
+    },
+    "empty_ops": {"plan_version": PLAN_SCHEMA_VERSION, "ops": []},
+    "unknown_version": {"plan_version": 999, "ops": []},
+    "float_coordinates": {
+        "plan_version": PLAN_SCHEMA_VERSION,
+        "ops": [
+            {"op": "add_component", "ref": "C1", "symbol": "Device:C", "value": "100nF", "at": [123.45, 67.89], "rot": 180}
+        ],
+    },
+}
+
+
+# Minimal valid KiCad 9.0 schematic template
+MINIMAL_SCHEMATIC_TEMPLATE = """(kicad_sch
+  (version 20231120)
+  (generator "eeschema")
+  (generator_version "9.0")
+  (uuid "12345678-1234-1234-1234-123456789abc")
+  (paper "A4")
+  (lib_symbols
+    (symbol "Device:R" (pin_numbers hide) (pin_names (offset 0)) (exclude_from_sim no) (in_bom yes) (on_board yes)
+      (property "Reference" "R" (at 2.032 0 90) (effects (font (size 1.27 1.27))))
+      (property "Value" "R" (at 0 0 90) (effects (font (size 1.27 1.27))))
+      (property "Footprint" "" (at -1.778 0 90) (effects (font (size 1.27 1.27)) hide))
+      (property "Datasheet" "~" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
+      (property "ki_keywords" "R res resistor" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
+      (property "ki_fp_filters" "R_*" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
+      (symbol "R_0_1"
+        (rectangle (start -1.016 -2.54) (end 1.016 2.54) (stroke (width 0.254) (type default)) (fill (type none)))
+      )
+      (symbol "R_1_1"
+        (pin passive line (at 0 3.81 270) (length 1.27) (name "~" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
+        (pin passive line (at 0 -3.81 90) (length 1.27) (name "~" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
+      )
+    )
+    (symbol "Device:LED" (pin_numbers hide) (pin_names (offset 1.016) hide) (exclude_from_sim no) (in_bom yes) (on_board yes)
+      (property "Reference" "D" (at 0 2.54 0) (effects (font (size 1.27 1.27))))
+      (property "Value" "LED" (at 0 -2.54 0) (effects (font (size 1.27 1.27))))
+      (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
+      (property "Datasheet" "~" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
+      (property "ki_keywords" "LED diode" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
+      (property "ki_fp_filters" "LED*" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
+      (symbol "LED_0_1"
+        (polyline (pts (xy -1.27 -1.27) (xy -1.27 1.27)) (stroke (width 0.254) (type default)) (fill (type none)))
+        (polyline (pts (xy -1.27 0) (xy 1.27 0)) (stroke (width 0) (type default)) (fill (type none)))
+        (polyline (pts (xy 1.27 -1.27) (xy 1.27 1.27) (xy -1.27 0) (xy 1.27 -1.27)) (stroke (width 0.254) (type default)) (fill (type none)))
+      )
+      (symbol "LED_1_1"
+        (pin passive line (at -3.81 0 0) (length 2.54) (name "K" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
+        (pin passive line (at 3.81 0 180) (length 2.54) (name "A" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
+      )
+    )
+  )
+  (junction (at 100 50) (diameter 0) (color 0 0 0 0) (uuid "11111111-1111-1111-1111-111111111111"))
+  (wire (pts (xy 95 50) (xy 105 50)) (stroke (width 0) (type default)) (uuid "22222222-2222-2222-2222-222222222222"))
+  (symbol_instances)
+  (sheet_instances
+    (path "/" (page "1"))
+  )
+)
+"""
+
+# Minimal valid KiCad 8 schematic with a few components
+MINIMAL_SCHEMATIC_WITH_COMPONENTS = """(kicad_sch
+    (version 20231120)
+    (generator "eeschema")
+    (uuid "00000000-0000-0000-0000-000000000001")
+    (paper "A4")
+    
+    (lib_symbols
+        (symbol "Device:R" 
+            (pin_numbers hide)
+            (pin_names (offset 0))
+            (property "Reference" "R" (at 0 0 0))
+            (property "Value" "R" (at 0 0 0))
+            (symbol "R_0_1"
+                (rectangle (start -1 -1) (end 1 1) (stroke (width 0.254)))
+            )
+            (symbol "R_1_1"
+                (pin passive line (at 0 0 90) (length 1) (name "~" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
+                (pin passive line (at 0 0 270) (length 1) (name "~" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
+            )
+        )
+        (symbol "Device:C"
+            (pin_numbers hide)
+            (pin_names (offset 0.254))
+            (property "Reference" "C" (at 0 0 0))
+            (property "Value" "C" (at 0 0 0))
+            (symbol "C_0_1"
+                (polyline (pts (xy -2 -0.5) (xy 2 -0.5)))
+                (polyline (pts (xy -2 0.5) (xy 2 0.5)))
+            )
+            (symbol "C_1_1"
+                (pin passive line (at 0 3 270) (length 2.54) (name "~" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
+                (pin passive line (at 0 -3 90) (length 2.54) (name "~" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
+            )
+        )
+    )
+    
+    (symbol (lib_id "Device:R") (at 100 50 0) (unit 1)
+        (uuid "00000000-0000-0000-0000-000000000002")
+        (property "Reference" "R1" (at 100 50 0))
+        (property "Value" "10k" (at 100 50 0))
+        (property "Footprint" "Resistor_SMD:R_0603_1608Metric" (at 100 50 0))
+        (pin "1" (uuid "00000000-0000-0000-0000-000000000003"))
+        (pin "2" (uuid "00000000-0000-0000-0000-000000000004"))
+    )
+    
+    (symbol (lib_id "Device:R") (at 150 50 0) (unit 1)
+        (uuid "00000000-0000-0000-0000-000000000005")
+        (property "Reference" "R47" (at 150 50 0))
+        (property "Value" "220" (at 150 50 0))
+        (property "Footprint" "Resistor_SMD:R_0805_2012Metric" (at 150 50 0))
+        (pin "1" (uuid "00000000-0000-0000-0000-000000000006"))
+        (pin "2" (uuid "00000000-0000-0000-0000-000000000007"))
+    )
+    
+    (symbol (lib_id "Device:C") (at 125 75 0) (unit 1)
+        (uuid "00000000-0000-0000-0000-000000000008")
+        (property "Reference" "C2" (at 125 75 0))
+        (property "Value" "100nF" (at 125 75 0))
+        (property "Footprint" "Capacitor_SMD:C_0603_1608Metric" (at 125 75 0))
+        (pin "1" (uuid "00000000-0000-0000-0000-000000000009"))
+        (pin "2" (uuid "00000000-0000-0000-0000-00000000000a"))
+    )
+    
+    (wire (pts (xy 100 50) (xy 110 50)) (stroke (width 0.254)))
+    (wire (pts (xy 140 50) (xy 150 50)) (stroke (width 0.254)))
+    
+    (label "VCC" (at 110 50 0))
+    (label "GND" (at 125 90 0))
+)
+"""
+
+
+@pytest.fixture(scope="session")
+def minimal_template_bytes() -> bytes:
+    """Empty KiCad 9.0 schematic with Device:R and Device:LED library symbols"""
+    return MINIMAL_SCHEMATIC_TEMPLATE.encode("ascii")
+
+
+@pytest.fixture(scope="session")
+def minimal_components_bytes() -> bytes:
+    """KiCad schematic with R1, R47, C2 placed and VCC/GND labels"""
+    return MINIMAL_SCHEMATIC_WITH_COMPONENTS.encode("ascii")
+
+
+@pytest.fixture(scope="session")
+def minimal_schematic_path(tmp_path_factory, minimal_template_bytes):
+    """Session-wide copy of the empty template on disk.
+
+    Shared across tests, so it must only be read. Tests that write back to the
+    schematic should write ``minimal_template_bytes`` to their own directory.
+    """
+    path = tmp_path_factory.mktemp("schematics") / "minimal.kicad_sch"
+    path.write_bytes(minimal_template_bytes)
+    return path
+
+
+@pytest.fixture(scope="session")
+def components_schematic_path(tmp_path_factory, minimal_components_bytes):
+    """Session-wide copy of the component schematic on disk (read-only)"""
+    path = tmp_path_factory.mktemp("schematics") / "components.kicad_sch"
+    path.write_bytes(minimal_components_bytes)
+    return path
+
+
+@pytest.fixture(scope="session")
+def mk_plan():
+    """Factory for unvalidated Plans built from trusted test literals"""
+    return _mk_plan
+
+
+@pytest.fixture(scope="session")
+def validated_plans():
+    """``PLAN_CORPUS`` validated in a single call, keyed by the same names"""
+    plans = TypeAdapter(list[Plan]).validate_python(list(PLAN_CORPUS.values()))
+    return dict(zip(PLAN_CORPUS, plans))
+
+
+@pytest.fixture(scope="session")
+def default_settings():
+    """Settings with every field at its default; shared, so tests must not mutate it"""
+    return Settings()
+
+
+@pytest.fixture(autouse=True)
+def fresh_kicad_cli_probe():
+    """Drop the cached kicad-cli probe so each test sees its own subprocess mocks"""
+    clear_kicad_cli_cache()
+
+
+@pytest.fixture(autouse=True)
+def fresh_keyring_lookup():
+    """Drop the cached keyring API key so each test sees its own keyring mocks"""
+    _keyring_api_key.cache_clear()
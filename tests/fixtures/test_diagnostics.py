@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from kaicad.core import writer
 from kaicad.schema.plan import ApplyResult, Diagnostic, Plan
 from kaicad.core.writer import apply_plan
 
@@ -25,6 +26,18 @@ def test_diagnostic_creation():
     assert diag.suggestion == "Ensure component exists before wiring"
 
 
+def test_diagnostic_is_frozen():
+    """Test that diagnostics are immutable and hashable"""
+    from pydantic import ValidationError
+
+    diag = Diagnostic(stage="writer", severity="info", message="Added R1")
+
+    with pytest.raises(ValidationError):
+        diag.message = "changed"
+
+    assert hash(diag) == hash(Diagnostic(stage="writer", severity="info", message="Added R1"))
+
+
 def test_apply_result_has_errors():
     """Test ApplyResult error detection"""
     result = ApplyResult(
@@ -54,6 +67,8 @@ def test_apply_result_has_warnings():
     assert result.has_errors() is False
     assert result.has_warnings() is True
     assert result.success is True
+    assert result.first_diagnostic("warning").message == "Test warning"
+    assert result.first_diagnostic("error") is None
 
 
 def test_apply_plan_returns_apply_result():
@@ -86,7 +101,7 @@ def test_apply_plan_diagnostic_on_error():
     mock_doc = Mock()
     mock_doc.symbol = []  # Empty iterable for ref index
 
-    with patch("kaicad.core.writer.Symbol") as MockSymbol:
+    with patch.object(writer, "Symbol") as MockSymbol:
         MockSymbol.from_lib.side_effect = Exception("Library not found")
 
         result = apply_plan(mock_doc, plan)
@@ -101,6 +116,19 @@ def test_apply_plan_diagnostic_on_error():
         assert errors[0].ref == "R1"
 
 
+def test_unsupported_op_reports_error():
+    """Test that an op without a writer handler is surfaced, not silently skipped"""
+    plan = Plan.model_construct(plan_version=1, ops=[Mock(op="move")], constraints={})
+
+    mock_doc = Mock()
+    mock_doc.symbol = []
+
+    result = apply_plan(mock_doc, plan)
+
+    assert result.success is False
+    assert [d.message for d in result.diagnostics] == ["Unsupported operation 'move'"]
+
+
 def test_symbol_from_lib_not_available_error():
     """Test that Symbol.from_lib works with the kicad-skip fork"""
     from skip.eeschema import schematic as sch
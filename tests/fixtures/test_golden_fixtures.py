@@ -1,5 +1,10 @@
 """Golden fixture tests for kAIcad - test full pipeline with real KiCad files"""
 
+import hashlib
+import importlib.metadata
+import importlib.util
+import inspect
+import os
 import subprocess
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -7,64 +12,17 @@ from tempfile import TemporaryDirectory
 import pytest
 from skip.eeschema import schematic as sch  # type: ignore
 
-from kaicad.schema.plan import PLAN_SCHEMA_VERSION, AddComponent, Label, Plan, Wire
+from kaicad.schema.plan import PLAN_SCHEMA_VERSION, AddComponent, Label, Plan
+from kaicad.core import writer
 from kaicad.core.writer import apply_plan
 
-# Minimal valid KiCad 9.0 schematic template
-MINIMAL_SCHEMATIC_TEMPLATE = """(kicad_sch
-  (version 20231120)
-  (generator "eeschema")
-  (generator_version "9.0")
-  (uuid "12345678-1234-1234-1234-123456789abc")
-  (paper "A4")
-  (lib_symbols
-    (symbol "Device:R" (pin_numbers hide) (pin_names (offset 0)) (exclude_from_sim no) (in_bom yes) (on_board yes)
-      (property "Reference" "R" (at 2.032 0 90) (effects (font (size 1.27 1.27))))
-      (property "Value" "R" (at 0 0 90) (effects (font (size 1.27 1.27))))
-      (property "Footprint" "" (at -1.778 0 90) (effects (font (size 1.27 1.27)) hide))
-      (property "Datasheet" "~" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-      (property "ki_keywords" "R res resistor" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-      (property "ki_fp_filters" "R_*" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-      (symbol "R_0_1"
-        (rectangle (start -1.016 -2.54) (end 1.016 2.54) (stroke (width 0.254) (type default)) (fill (type none)))
-      )
-      (symbol "R_1_1"
-        (pin passive line (at 0 3.81 270) (length 1.27) (name "~" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin passive line (at 0 -3.81 90) (length 1.27) (name "~" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-      )
-    )
-    (symbol "Device:LED" (pin_numbers hide) (pin_names (offset 1.016) hide) (exclude_from_sim no) (in_bom yes) (on_board yes)
-      (property "Reference" "D" (at 0 2.54 0) (effects (font (size 1.27 1.27))))
-      (property "Value" "LED" (at 0 -2.54 0) (effects (font (size 1.27 1.27))))
-      (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-      (property "Datasheet" "~" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-      (property "ki_keywords" "LED diode" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-      (property "ki_fp_filters" "LED*" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-      (symbol "LED_0_1"
-        (polyline (pts (xy -1.27 -1.27) (xy -1.27 1.27)) (stroke (width 0.254) (type default)) (fill (type none)))
-        (polyline (pts (xy -1.27 0) (xy 1.27 0)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 1.27 -1.27) (xy 1.27 1.27) (xy -1.27 0) (xy 1.27 -1.27)) (stroke (width 0.254) (type default)) (fill (type none)))
-      )
-      (symbol "LED_1_1"
-        (pin passive line (at -3.81 0 0) (length 2.54) (name "K" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin passive line (at 3.81 0 180) (length 2.54) (name "A" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-      )
-    )
-  )
-  (junction (at 100 50) (diameter 0) (color 0 0 0 0) (uuid "11111111-1111-1111-1111-111111111111"))
-  (wire (pts (xy 95 50) (xy 105 50)) (stroke (width 0) (type default)) (uuid "22222222-2222-2222-2222-222222222222"))
-  (symbol_instances)
-  (sheet_instances
-    (path "/" (page "1"))
-  )
-)
-"""
-
 
 def has_kicad_cli() -> bool:
     """Check if kicad-cli is available on PATH"""
     try:
-        result = subprocess.run(["kicad-cli", "--version"], capture_output=True, timeout=3, check=False)
+        result = subprocess.run(
+            ["kicad-cli", "--version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=3, check=False
+        )
         return result.returncode == 0
     except (FileNotFoundError, subprocess.TimeoutExpired):
         return False
@@ -72,39 +30,83 @@ def has_kicad_cli() -> bool:
 
 def can_add_components() -> bool:
     """Detect whether kicad-skip supports programmatic symbol creation from libraries."""
-    try:
-        from skip.eeschema.schematic.symbol import Symbol
-        
-        return hasattr(Symbol, "from_lib")
-    except Exception:
+    if importlib.util.find_spec("skip.eeschema.schematic.symbol") is None:
         return False
+    from skip.eeschema.schematic.symbol import Symbol
+
+    return hasattr(Symbol, "from_lib")
+
+
+# Probed once at import instead of once per decorated test
+_HAS_KICAD_CLI = has_kicad_cli()
+_CAN_ADD_COMPONENTS = can_add_components()
 
 
-@pytest.mark.skipif(not has_kicad_cli(), reason="kicad-cli not found in PATH")
+# LED + resistor plan shared by the ERC test and the cached applied schematic
+_LED_RESISTOR_PLAN = Plan(
+    plan_version=PLAN_SCHEMA_VERSION,
+    ops=[
+        AddComponent(op="add_component", ref="R1", symbol="Device:R", value="1k", at=(100, 60), rot=0),
+        AddComponent(op="add_component", ref="D1", symbol="Device:LED", value="RED", at=(120, 60), rot=0),
+        Label(op="label", net="VCC", at=(90, 60)),
+    ],
+)
+
+
+@pytest.fixture(scope="session")
+def golden_applied_schematic(request, tmp_path_factory, minimal_template_bytes) -> Path:
+    """
+    Template with the LED + resistor plan applied and written back to disk.
+
+    The result is stored in the pytest cache keyed on the template bytes, the
+    serialized plan (which includes the schema version), the writer source and
+    the installed kicad-skip version, so later runs and parallel workers reuse
+    it instead of repeating the apply, while any change to the code producing
+    it forces a rebuild. The file is moved into place atomically, so concurrent
+    workers never see a partial write. Pass ``--no-golden-cache`` to force a
+    rebuild.
+    """
+    key_parts = (
+        minimal_template_bytes,
+        _LED_RESISTOR_PLAN.model_dump_json().encode(),
+        inspect.getsource(writer).encode(),
+        importlib.metadata.version("kicad-skip").encode(),
+    )
+    key = hashlib.sha256(b"\0".join(key_parts)).hexdigest()[:16]
+    cache = getattr(request.config, "cache", None)
+    if cache is not None and not request.config.getoption("--no-golden-cache"):
+        cached = cache.mkdir("kaicad-golden") / f"{key}.kicad_sch"
+        if cached.exists():
+            return cached
+    else:
+        cached = tmp_path_factory.mktemp("kaicad-golden") / f"{key}.kicad_sch"
+
+    staging = cached.with_name(f"{key}.{os.getpid()}.tmp.kicad_sch")
+    staging.write_bytes(minimal_template_bytes)
+    doc = sch.Schematic(str(staging))
+    result = apply_plan(doc, _LED_RESISTOR_PLAN)
+    assert result.success, f"Apply failed: {[d.message for d in result.diagnostics if d.severity == 'error']}"
+    doc.write(str(staging))
+    os.replace(staging, cached)
+    return cached
+
+
+@pytest.mark.skipif(not _HAS_KICAD_CLI, reason="kicad-cli not found in PATH")
 @pytest.mark.skipif(
-    not can_add_components(), reason="kicad-skip does not support programmatic symbol creation in this environment"
+    not _CAN_ADD_COMPONENTS, reason="kicad-skip does not support programmatic symbol creation in this environment"
 )
-def test_add_led_resistor_with_erc():
+def test_add_led_resistor_with_erc(minimal_template_bytes):
     """
     Golden fixture test: Add LED + resistor, verify components exist,
     and check that ERC runs without crashing.
     """
     with TemporaryDirectory() as tmpdir:
         sch_path = Path(tmpdir) / "test.kicad_sch"
-        sch_path.write_text(MINIMAL_SCHEMATIC_TEMPLATE, encoding="utf-8")
-
-        # Create plan to add LED and resistor
-        plan = Plan(
-            plan_version=PLAN_SCHEMA_VERSION,
-            ops=[
-                AddComponent(op="add_component", ref="R1", symbol="Device:R", value="1k", at=(100, 60), rot=0),
-                AddComponent(op="add_component", ref="D1", symbol="Device:LED", value="RED", at=(120, 60), rot=0),
-                Label(op="label", net="VCC", at=(90, 60)),
-            ],
-        )
-        # Apply plan
+        sch_path.write_bytes(minimal_template_bytes)
+
+        # Apply plan to add LED and resistor
         doc = sch.Schematic(str(sch_path))
-        result = apply_plan(doc, plan)
+        result = apply_plan(doc, _LED_RESISTOR_PLAN)
 
         # Verify success
         assert result.success, f"Apply failed: {[d.message for d in result.diagnostics if d.severity == 'error']}"
@@ -116,21 +118,17 @@ def test_add_led_resistor_with_erc():
 
         # Re-read and verify components exist
         doc = sch.Schematic(str(sch_path))
-        symbols = list(getattr(doc, "symbol", []))
 
         # Import helper to get symbol references
         from kaicad.core.writer import get_symbol_ref
-        
-        refs = [get_symbol_ref(s) for s in symbols if get_symbol_ref(s)]
-        assert "R1" in refs, f"R1 not found in schematic, found: {refs}"
-        assert "D1" in refs, f"D1 not found in schematic, found: {refs}"
 
-        # Find our symbols and verify values
-        r1 = next((s for s in symbols if get_symbol_ref(s) == "R1"), None)
-        d1 = next((s for s in symbols if get_symbol_ref(s) == "D1"), None)
+        # Index symbols by reference in a single pass
+        by_ref = {ref: s for s in getattr(doc, "symbol", []) if (ref := get_symbol_ref(s))}
+        assert "R1" in by_ref, f"R1 not found in schematic, found: {list(by_ref)}"
+        assert "D1" in by_ref, f"D1 not found in schematic, found: {list(by_ref)}"
 
-        assert r1 is not None, "R1 symbol not found"
-        assert d1 is not None, "D1 symbol not found"
+        r1 = by_ref["R1"]
+        d1 = by_ref["D1"]
         # Access Value property's value attribute
         assert r1.Value.value == "1k", f"R1 value wrong: {r1.Value.value}"
         assert d1.Value.value == "RED", f"D1 value wrong: {d1.Value.value}"
@@ -139,7 +137,8 @@ def test_add_led_resistor_with_erc():
         erc_output = sch_path.with_suffix(".erc.txt")
         result = subprocess.run(
             ["kicad-cli", "sch", "erc", str(sch_path), "-o", str(erc_output), "--format", "report"],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=10,
             check=False,
         )
@@ -149,27 +148,26 @@ def test_add_led_resistor_with_erc():
         assert erc_output.exists(), "ERC output file not created"
 
 
-@pytest.mark.skipif(not has_kicad_cli(), reason="kicad-cli not found in PATH")
+@pytest.mark.skipif(not _HAS_KICAD_CLI, reason="kicad-cli not found in PATH")
 @pytest.mark.skipif(
-    not can_add_components(), reason="kicad-skip does not support programmatic symbol creation in this environment"
+    not _CAN_ADD_COMPONENTS, reason="kicad-skip does not support programmatic symbol creation in this environment"
 )
-def test_wire_operation_creates_connection():
+def test_wire_operation_creates_connection(minimal_template_bytes, mk_plan):
     """
     Test that wire operations create valid connections.
     This test verifies the wire implementation is not a no-op.
     """
     with TemporaryDirectory() as tmpdir:
         sch_path = Path(tmpdir) / "test_wire.kicad_sch"
-        sch_path.write_text(MINIMAL_SCHEMATIC_TEMPLATE, encoding="utf-8")
+        sch_path.write_bytes(minimal_template_bytes)
 
         # Create plan with components and wire
-        plan = Plan(
-            plan_version=PLAN_SCHEMA_VERSION,
-            ops=[
-                AddComponent(op="add_component", ref="R1", symbol="Device:R", value="1k", at=(100, 60), rot=0),
-                AddComponent(op="add_component", ref="R2", symbol="Device:R", value="2k", at=(120, 60), rot=0),
-                Wire(op="wire", from_="R1:2", to="R2:1"),
-            ],
+        plan = mk_plan(
+            [
+                {"op": "add_component", "ref": "R1", "symbol": "Device:R", "value": "1k", "at": (100, 60), "rot": 0},
+                {"op": "add_component", "ref": "R2", "symbol": "Device:R", "value": "2k", "at": (120, 60), "rot": 0},
+                {"op": "wire", "from_": "R1:2", "to": "R2:1"},
+            ]
         )
 
         # Apply plan
@@ -193,62 +191,55 @@ def test_wire_operation_creates_connection():
         # Verify KiCad can read the file
         result = subprocess.run(
             ["kicad-cli", "sch", "export", "pdf", str(sch_path), "-o", str(sch_path.with_suffix(".pdf"))],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=10,
             check=False,
         )
         assert result.returncode == 0, f"KiCad failed to process schematic: {result.stderr.decode()}"
 
 
-def test_label_operation_failure_surfaces():
+def test_label_operation_failure_surfaces(minimal_schematic_path, mk_plan):
     """
     Test that label failures are surfaced in diagnostics, not swallowed.
     """
-    with TemporaryDirectory() as tmpdir:
-        sch_path = Path(tmpdir) / "test_label.kicad_sch"
-        sch_path.write_text(MINIMAL_SCHEMATIC_TEMPLATE, encoding="utf-8")
-
-        # Create plan with label at potentially invalid position
-        plan = Plan(plan_version=PLAN_SCHEMA_VERSION, ops=[Label(op="label", net="TEST_NET", at=(100, 60))])
+    # Create plan with label at potentially invalid position
+    plan = mk_plan([{"op": "label", "net": "TEST_NET", "at": (100, 60)}])
 
-        # Apply plan
-        doc = sch.Schematic(str(sch_path))
-        result = apply_plan(doc, plan)
+    # Apply plan
+    doc = sch.Schematic(str(minimal_schematic_path))
+    result = apply_plan(doc, plan)
 
-        # Label should either succeed with info diagnostic, or fail with error diagnostic
-        label_diagnostics = [d for d in result.diagnostics if "label" in d.message.lower()]
-        assert len(label_diagnostics) > 0, "Label operation produced no diagnostics"
+    # Label should either succeed with info diagnostic, or fail with error diagnostic
+    label_diagnostics = [d for d in result.diagnostics if "label" in d.message.lower()]
+    assert len(label_diagnostics) > 0, "Label operation produced no diagnostics"
 
-        # Verify diagnostic is explicit (not silently swallowed)
-        for d in label_diagnostics:
-            assert d.severity in ["info", "error", "warning"], f"Unexpected severity: {d.severity}"
-            assert len(d.message) > 0, "Empty diagnostic message"
+    # Verify diagnostic is explicit (not silently swallowed)
+    for d in label_diagnostics:
+        assert d.severity in ["info", "error", "warning"], f"Unexpected severity: {d.severity}"
+        assert len(d.message) > 0, "Empty diagnostic message"
 
 
-def test_schema_version_mismatch_prevents_apply():
+def test_schema_version_mismatch_prevents_apply(minimal_schematic_path, mk_plan):
     """
     Test that schema version mismatch is caught early and prevents application.
     """
-    with TemporaryDirectory() as tmpdir:
-        sch_path = Path(tmpdir) / "test_version.kicad_sch"
-        sch_path.write_text(MINIMAL_SCHEMATIC_TEMPLATE, encoding="utf-8")
-
-        # Create plan with wrong version
-        plan = Plan(
-            plan_version=999,  # Invalid version
-            ops=[Label(op="label", net="TEST", at=(100, 100))],
-        )
+    # Create plan with wrong version (unvalidated; apply_plan performs the version check)
+    plan = mk_plan(
+        [{"op": "label", "net": "TEST", "at": (100, 100)}],
+        plan_version=999,  # Invalid version
+    )
 
-        doc = sch.Schematic(str(sch_path))
-        result = apply_plan(doc, plan)
+    doc = sch.Schematic(str(minimal_schematic_path))
+    result = apply_plan(doc, plan)
 
-        # Should fail with schema version error
-        assert result.success is False
-        assert result.has_errors()
+    # Should fail with schema version error
+    assert result.success is False
+    assert result.has_errors()
 
-        errors = [d for d in result.diagnostics if d.severity == "error"]
-        assert len(errors) > 0
-        assert any("schema version" in e.message.lower() for e in errors)
+    errors = [d for d in result.diagnostics if d.severity == "error"]
+    assert len(errors) > 0
+    assert any("schema version" in e.message.lower() for e in errors)
 
 
 def test_apply_result_structure():
@@ -285,34 +276,21 @@ def test_apply_result_structure():
     assert len(fail_result.affected_refs) == 0
 
 
-@pytest.mark.skipif(not has_kicad_cli(), reason="kicad-cli not found in PATH")
+@pytest.mark.skipif(not _HAS_KICAD_CLI, reason="kicad-cli not found in PATH")
 @pytest.mark.skipif(
-    not can_add_components(), reason="kicad-skip does not support programmatic symbol creation in this environment"
+    not _CAN_ADD_COMPONENTS, reason="kicad-skip does not support programmatic symbol creation in this environment"
 )
-def test_netlist_export_after_apply():
+def test_netlist_export_after_apply(golden_applied_schematic):
     """
     Test that netlist export works after applying a plan.
     """
     with TemporaryDirectory() as tmpdir:
-        sch_path = Path(tmpdir) / "test_netlist.kicad_sch"
-        sch_path.write_text(MINIMAL_SCHEMATIC_TEMPLATE, encoding="utf-8")
-
-        plan = Plan(
-            plan_version=PLAN_SCHEMA_VERSION,
-            ops=[AddComponent(op="add_component", ref="R1", symbol="Device:R", value="10k", at=(100, 60))],
-        )
-
-        doc = sch.Schematic(str(sch_path))
-        result = apply_plan(doc, plan)
-        assert result.success
-
-        doc.write(str(sch_path))
-
-        # Export netlist
-        netlist_path = sch_path.with_suffix(".net")
+        # Export netlist from the cached applied schematic
+        netlist_path = Path(tmpdir) / "test_netlist.net"
         result = subprocess.run(
-            ["kicad-cli", "sch", "export", "netlist", str(sch_path), "-o", str(netlist_path)],
-            capture_output=True,
+            ["kicad-cli", "sch", "export", "netlist", str(golden_applied_schematic), "-o", str(netlist_path)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=10,
             check=False,
         )
@@ -321,6 +299,5 @@ def test_netlist_export_after_apply():
         assert netlist_path.exists(), "Netlist file not created"
 
         # Verify netlist contains our component
-    netlist_content = netlist_path.read_text(encoding="utf-8")
-    assert "R1" in netlist_content, "R1 not found in netlist"
-
+        netlist_content = netlist_path.read_text(encoding="utf-8")
+        assert "R1" in netlist_content, "R1 not found in netlist"
@@ -1,11 +1,17 @@
 """Tests for inspector module - component and net inspection"""
 
+import os
+import re
 from pathlib import Path
-from tempfile import TemporaryDirectory
+from unittest.mock import Mock
 
 import pytest
 
 from kaicad.core.inspector import (
+    _compile_pattern,
+    _index_schematic,
+    _inspect_schematic_cached,
+    _load_schematic,
     find_component_by_reference,
     find_components_by_pattern,
     format_inspection_report,
@@ -16,87 +22,17 @@ from kaicad.core.inspector import (
     search_components,
 )
 
-# Minimal valid KiCad 8 schematic with a few components
-MINIMAL_SCHEMATIC_WITH_COMPONENTS = """(kicad_sch
-    (version 20231120)
-    (generator "eeschema")
-    (uuid "00000000-0000-0000-0000-000000000001")
-    (paper "A4")
-    
-    (lib_symbols
-        (symbol "Device:R" 
-            (pin_numbers hide)
-            (pin_names (offset 0))
-            (property "Reference" "R" (at 0 0 0))
-            (property "Value" "R" (at 0 0 0))
-            (symbol "R_0_1"
-                (rectangle (start -1 -1) (end 1 1) (stroke (width 0.254)))
-            )
-            (symbol "R_1_1"
-                (pin passive line (at 0 0 90) (length 1) (name "~" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-                (pin passive line (at 0 0 270) (length 1) (name "~" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-            )
-        )
-        (symbol "Device:C"
-            (pin_numbers hide)
-            (pin_names (offset 0.254))
-            (property "Reference" "C" (at 0 0 0))
-            (property "Value" "C" (at 0 0 0))
-            (symbol "C_0_1"
-                (polyline (pts (xy -2 -0.5) (xy 2 -0.5)))
-                (polyline (pts (xy -2 0.5) (xy 2 0.5)))
-            )
-            (symbol "C_1_1"
-                (pin passive line (at 0 3 270) (length 2.54) (name "~" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-                (pin passive line (at 0 -3 90) (length 2.54) (name "~" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-            )
-        )
-    )
-    
-    (symbol (lib_id "Device:R") (at 100 50 0) (unit 1)
-        (uuid "00000000-0000-0000-0000-000000000002")
-        (property "Reference" "R1" (at 100 50 0))
-        (property "Value" "10k" (at 100 50 0))
-        (property "Footprint" "Resistor_SMD:R_0603_1608Metric" (at 100 50 0))
-        (pin "1" (uuid "00000000-0000-0000-0000-000000000003"))
-        (pin "2" (uuid "00000000-0000-0000-0000-000000000004"))
-    )
-    
-    (symbol (lib_id "Device:R") (at 150 50 0) (unit 1)
-        (uuid "00000000-0000-0000-0000-000000000005")
-        (property "Reference" "R47" (at 150 50 0))
-        (property "Value" "220" (at 150 50 0))
-        (property "Footprint" "Resistor_SMD:R_0805_2012Metric" (at 150 50 0))
-        (pin "1" (uuid "00000000-0000-0000-0000-000000000006"))
-        (pin "2" (uuid "00000000-0000-0000-0000-000000000007"))
-    )
-    
-    (symbol (lib_id "Device:C") (at 125 75 0) (unit 1)
-        (uuid "00000000-0000-0000-0000-000000000008")
-        (property "Reference" "C2" (at 125 75 0))
-        (property "Value" "100nF" (at 125 75 0))
-        (property "Footprint" "Capacitor_SMD:C_0603_1608Metric" (at 125 75 0))
-        (pin "1" (uuid "00000000-0000-0000-0000-000000000009"))
-        (pin "2" (uuid "00000000-0000-0000-0000-00000000000a"))
-    )
-    
-    (wire (pts (xy 100 50) (xy 110 50)) (stroke (width 0.254)))
-    (wire (pts (xy 140 50) (xy 150 50)) (stroke (width 0.254)))
-    
-    (label "VCC" (at 110 50 0))
-    (label "GND" (at 125 90 0))
-)
-"""
+# Compiled once at import; find_components_by_pattern uses compiled patterns as-is
+_R_REF_PATTERN = re.compile(r"^R\d+$")
+
+# Prototype component record; tests override only the per-row fields
+_RESISTOR_PROTO = {"ref": None, "value": None, "symbol": "Device:R", "position": None}
 
 
-@pytest.fixture
-def test_schematic():
-    """Create a temporary test schematic file"""
-    with TemporaryDirectory() as tmpdir:
-        sch_path = Path(tmpdir) / "test.kicad_sch"
-        with sch_path.open("w") as f:
-            f.write(MINIMAL_SCHEMATIC_WITH_COMPONENTS)
-        yield sch_path
+@pytest.fixture(scope="session")
+def test_schematic(components_schematic_path):
+    """Shared on-disk test schematic (read-only)"""
+    return components_schematic_path
 
 
 def test_inspect_schematic_basic(test_schematic):
@@ -143,7 +79,7 @@ def test_search_components(test_schematic):
 
 def test_find_components_by_pattern(test_schematic):
     """Test finding components by regex pattern"""
-    result = find_components_by_pattern(test_schematic, r"^R\d+$")
+    result = find_components_by_pattern(test_schematic, _R_REF_PATTERN)
 
     # Should return a list (even if empty)
     assert isinstance(result, list)
@@ -261,9 +197,9 @@ def test_format_inspection_report_with_hierarchy():
 
 def test_format_inspection_report_many_components():
     """Test formatting report with many components (should truncate)"""
-    # Create 30 components
+    # Create 30 components from a shared prototype row
     components = [
-        {"ref": f"R{i}", "value": f"{i}k", "symbol": "Device:R", "position": (i * 10, 50)} for i in range(1, 31)
+        dict(_RESISTOR_PROTO, ref=f"R{i}", value=f"{i}k", position=(i * 10, 50)) for i in range(1, 31)
     ]
 
     inspection = {
@@ -331,6 +267,15 @@ def test_find_components_by_pattern_wildcard(test_schematic):
     assert isinstance(result, list)
 
 
+def test_compile_pattern_uses_shell_wildcards():
+    """Test wildcard patterns match whole references case-insensitively"""
+    assert _compile_pattern("R*").match("r47")
+    assert _compile_pattern("U[1-3]").match("U2")
+    assert not _compile_pattern("U[1-3]").match("U20")
+    assert not _compile_pattern("C?").match("C.1")
+    assert _compile_pattern("R*") is _compile_pattern("R*")
+
+
 def test_inspect_net_connections_nonexistent(test_schematic):
     """Test inspecting a net that doesn't exist"""
     result = inspect_net_connections(test_schematic, "NONEXISTENT_NET")
@@ -352,23 +297,120 @@ def test_get_component_connections_nonexistent(test_schematic):
         assert "error" in result
 
 
-def test_inspect_hierarchical_design_with_hierarchy():
+def test_inspect_hierarchical_design_with_hierarchy(test_schematic):
     """Test hierarchical inspection when sheets are present"""
-    # Create a schematic with hierarchy reference (even if files don't exist)
-    with TemporaryDirectory() as tmpdir:
-        root_path = Path(tmpdir) / "root.kicad_sch"
+    result = inspect_hierarchical_design(test_schematic)
+
+    assert "root" in result
+    assert "subsheets" in result
+    assert isinstance(result["root"], dict)
+    assert isinstance(result["subsheets"], dict)
+
+
+def test_load_schematic_cached_until_file_changes(tmp_path, minimal_components_bytes):
+    """Test parsed schematics are reused until the file's mtime changes"""
+    sch_path = tmp_path / "cached.kicad_sch"
+    sch_path.write_bytes(minimal_components_bytes)
+
+    first = _load_schematic(sch_path)
+    assert _load_schematic(sch_path) is first
+
+    stat = sch_path.stat()
+    os.utime(sch_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert _load_schematic(sch_path) is not first
+
+
+def test_load_schematic_sees_rewrite_within_same_mtime(tmp_path, minimal_components_bytes):
+    """Test a rewrite that keeps the mtime (coarse timestamps) but changes the size is re-parsed"""
+    sch_path = tmp_path / "coarse.kicad_sch"
+    sch_path.write_bytes(minimal_components_bytes)
+    stat = sch_path.stat()
+
+    first = _load_schematic(sch_path)
+    sch_path.write_bytes(minimal_components_bytes + b"\n")
+    os.utime(sch_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert _load_schematic(sch_path) is not first
+
+
+def test_inspect_schematic_memoized_until_file_changes(tmp_path, minimal_components_bytes):
+    """Test repeat inspections of an unchanged file reuse the cached result"""
+    sch_path = tmp_path / "memo.kicad_sch"
+    sch_path.write_bytes(minimal_components_bytes)
+
+    first = inspect_schematic(sch_path)
+    hits = _inspect_schematic_cached.cache_info().hits
+    assert inspect_schematic(sch_path) == first
+    assert _inspect_schematic_cached.cache_info().hits == hits + 1
+
+    stat = sch_path.stat()
+    os.utime(sch_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    inspect_schematic(sch_path)
+    assert _inspect_schematic_cached.cache_info().hits == hits + 1
+
+
+def test_inspect_schematic_results_are_independent(tmp_path, minimal_components_bytes):
+    """Test mutating one inspection result doesn't leak into later calls"""
+    sch_path = tmp_path / "mutable.kicad_sch"
+    sch_path.write_bytes(minimal_components_bytes)
+
+    first = inspect_schematic(sch_path)
+    first["components"].append({"ref": "X99"})
+    first["stats"]["component_types"]["X"] = 1
+
+    second = inspect_schematic(sch_path)
+    assert second is not first
+    assert {"ref": "X99"} not in second["components"]
+    assert "X" not in second["stats"]["component_types"]
+
+
+def test_index_schematic_builds_ref_and_net_indices():
+    """Test symbols are indexed by upper-cased ref and labels by net name"""
+    r1, c2 = Mock(), Mock()
+    r1.Reference.value = "R1"
+    c2.Reference.value = "c2"
+    vcc_a, vcc_b, gnd = Mock(), Mock(), Mock()
+    vcc_a.value = "VCC"
+    vcc_b.value = "VCC"
+    gnd.value = "GND"
+    doc = Mock()
+    doc.symbol = [r1, c2]
+    doc.label = [vcc_a, gnd, vcc_b]
+
+    parsed = _index_schematic(doc)
+
+    assert parsed.doc is doc
+    assert parsed.by_ref == {"R1": r1, "C2": c2}
+    assert parsed.by_net == {"VCC": [vcc_a, vcc_b], "GND": [gnd]}
+
+
+def test_index_schematic_on_real_schematic(tmp_path, minimal_components_bytes):
+    """Test the indices are populated from an actual kicad-skip document"""
+    sch_path = tmp_path / "indexed.kicad_sch"
+    sch_path.write_bytes(minimal_components_bytes)
+
+    parsed = _load_schematic(sch_path)
+
+    assert set(parsed.by_ref) == {"R1", "R47", "C2"}
+    assert {net: len(labels) for net, labels in parsed.by_net.items()} == {"VCC": 1, "GND": 1}
+
+
+def test_lookups_on_real_schematic(components_schematic_path):
+    """Test the reference, pattern, search and net lookups read real kicad-skip symbols"""
+    r1 = find_component_by_reference(components_schematic_path, "r1")
+    assert r1["success"]
+    assert (r1["ref"], r1["value"], r1["symbol"], r1["position"]) == ("R1", "10k", "Device:R", (100, 50))
+    assert r1["fields"]["Reference"] == "R1"
+    assert [pin["number"] for pin in r1["pins"]] == ["1", "2"]
 
-        # Write a schematic that references sub-sheets
-        schematic_with_sheets = MINIMAL_SCHEMATIC_WITH_COMPONENTS
-        with root_path.open("w") as f:
-            f.write(schematic_with_sheets)
+    assert [c["ref"] for c in find_components_by_pattern(components_schematic_path, "R*")] == ["R1", "R47"]
+    assert [c["ref"] for c in search_components(components_schematic_path, "10k")] == ["R1"]
 
-        result = inspect_hierarchical_design(root_path)
+    connections = get_component_connections(components_schematic_path, "R1")
+    assert connections["success"]
+    assert [label["text"] for label in connections["component"]["nearby_nets"]] == ["VCC"]
 
-        assert "root" in result
-        assert "subsheets" in result
-        assert isinstance(result["root"], dict)
-        assert isinstance(result["subsheets"], dict)
+    vcc = inspect_net_connections(components_schematic_path, "VCC")
+    assert vcc["labels"] == [{"text": "VCC", "position": (110, 50)}]
 
 
 if __name__ == "__main__":
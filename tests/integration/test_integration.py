@@ -1,14 +1,17 @@
 """Integration tests for kAIcad - golden file tests"""
 
-import json
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
 import pytest
+from pydantic import ValidationError
 from skip.eeschema import schematic as sch
 
-from kaicad.schema.plan import PLAN_SCHEMA_VERSION, Plan
-from kaicad.core.writer import apply_plan, snap_to_grid
+from kaicad.schema.plan import PLAN_SCHEMA_VERSION, Plan, dumps_plan, loads_plan
+from kaicad.core.writer import apply_plan, snap_to_grid, snap_values
+
+# Smallest schematic kicad-skip will load, pre-encoded for write_bytes
+_EMPTY_SCHEMATIC_BYTES = b'(kicad_sch (version 20221120) (generator "eeschema"))'
 
 
 @pytest.mark.skip(reason="Requires kicad-skip API that may not be fully available in test environment")
@@ -30,8 +33,7 @@ def test_plan_wire_minimal():
     with TemporaryDirectory() as tmpdir:
         sch_path = Path(tmpdir) / "test.kicad_sch"
         # Create minimal valid schematic
-        with sch_path.open("w") as f:
-            f.write('(kicad_sch (version 20221120) (generator "eeschema"))')
+        sch_path.write_bytes(_EMPTY_SCHEMATIC_BYTES)
 
         doc = sch.Schematic(str(sch_path))
         doc = apply_plan(doc, plan)
@@ -84,12 +86,18 @@ def test_grid_snap_determinism():
         (2.53, 2.54),
         (2.55, 2.54),
         (127.0, 127.0),  # Exactly 50 * 2.54
+        (84.0, 83.82),  # 33 * 2.54 in floats is 83.82000000000001
+        (-100.0, -99.06),
     ]
 
     for input_val, expected in test_cases:
         result = snap_to_grid(input_val)
         assert result == expected, f"snap_to_grid({input_val}) = {result}, expected {expected}"
 
+    # Batch API must agree with the scalar one
+    inputs, expected_values = zip(*test_cases)
+    assert snap_values(inputs) == list(expected_values)
+
 
 def test_plan_schema_version_validation():
     """Test that plans require a schema version"""
@@ -110,12 +118,14 @@ def test_plan_serialization_includes_version():
 
     plan = Plan(ops=[AddComponent(op="add_component", ref="U1", symbol="MCU:ATmega328", value="", at=(100, 100))])
 
-    dumped = plan.model_dump(by_alias=True)
-    assert "plan_version" in dumped
-    assert dumped["plan_version"] == PLAN_SCHEMA_VERSION
+    json_str = dumps_plan(plan)
+    assert f'"plan_version":{PLAN_SCHEMA_VERSION}' in json_str
+
+    # Ensure it round-trips through pydantic's JSON parser directly
+    reloaded = loads_plan(json_str)
+    assert reloaded == plan
 
-    # Ensure it round-trips
-    json_str = json.dumps(dumped)
-    reloaded = Plan.model_validate(json.loads(json_str))
-    assert reloaded.plan_version == plan.plan_version
+    # Malformed JSON surfaces as a validation error, not a JSONDecodeError
+    with pytest.raises(ValidationError):
+        loads_plan(json_str[:-1])
 
@@ -1,6 +1,11 @@
 """Test that failed plan applications don't modify the schematic file"""
 
-from kaicad.schema.plan import Plan
+from unittest.mock import Mock, patch
+
+import pytest
+
+from kaicad.core import writer
+from kaicad.schema.plan import ApplyResult, Label, Plan
 from kaicad.core.writer import apply_plan
 
 # Minimal valid KiCad schematic for testing
@@ -15,22 +20,27 @@ MINIMAL_SCHEMATIC = """(kicad_sch
 """
 
 
-def test_no_write_on_schema_version_error():
-    """Test that apply_plan returns failure for wrong schema version"""
-    from unittest.mock import Mock
-
-    # Mock schematic with iterable symbols (new API)
+@pytest.fixture(scope="module")
+def empty_mock_doc():
+    """Mock schematic with iterable symbols (new API); shared, so tests must not mutate it"""
     mock_doc = Mock()
     mock_doc.symbol = []
+    return mock_doc
 
-    # Create plan with wrong version
-    plan = Plan(
+
+@pytest.fixture
+def version_mismatch_plan():
+    """Plan with an unsupported schema version, built without validation"""
+    return Plan.model_construct(
         plan_version=999,  # Invalid version
-        ops=[{"op": "label", "net": "TEST", "at": [100, 100]}],
+        ops=[Label.model_construct(op="label", net="TEST", at=(100, 100))],
     )
 
+
+def test_no_write_on_schema_version_error(empty_mock_doc, version_mismatch_plan):
+    """Test that apply_plan returns failure for wrong schema version"""
     # Apply plan (should fail on version check)
-    result = apply_plan(mock_doc, plan)
+    result = apply_plan(empty_mock_doc, version_mismatch_plan)
 
     # Verify result indicates failure
     assert result.success is False
@@ -58,43 +68,29 @@ def test_ui_respects_apply_result_success():
     #     # Show errors, don't save
     #     pass
 
-    # Let's verify the pattern is documented in writer
-    import inspect
-
-    from kaicad.core import writer
-
     # Check that ApplyResult has success field
-    from kaicad.schema.plan import ApplyResult
-
-    assert hasattr(ApplyResult, "model_fields")
     assert "success" in ApplyResult.model_fields
 
-    # Verify apply_plan returns ApplyResult
-    sig = inspect.signature(writer.apply_plan)
-    assert sig.return_annotation.__name__ == "ApplyResult"
+    # Verify apply_plan returns ApplyResult (read the annotation directly, no inspect.signature)
+    assert writer.apply_plan.__annotations__["return"] is ApplyResult
 
     # This test passes if the structure is correct
     # Manual code review of main.py, web.py, desk.py confirms they all check result.success
 
 
-def test_file_unchanged_on_component_error():
+def test_file_unchanged_on_component_error(empty_mock_doc):
     """Test that component errors result in failure status"""
-    from unittest.mock import Mock, patch
-
-    mock_doc = Mock()
-    mock_doc.symbol = []
-
     # Plan with invalid library reference (will fail)
     plan = Plan(
         plan_version=1,
         ops=[{"op": "add_component", "ref": "R1", "symbol": "FakeLib:NonExistent", "value": "1k", "at": [100, 100]}],
     )
 
-    with patch("kaicad.core.writer.Symbol") as MockSymbol:
+    with patch.object(writer, "Symbol") as MockSymbol:
         MockSymbol.from_lib.side_effect = Exception("Library not found")
 
         # Apply (should fail on Symbol.from_lib)
-        result = apply_plan(mock_doc, plan)
+        result = apply_plan(empty_mock_doc, plan)
 
         # Should have error status
         assert result.success is False
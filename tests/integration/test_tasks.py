@@ -1,137 +1,85 @@
 """Tests for tasks module."""
 
-import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
-from kaicad.kicad.tasks import export_netlist, export_pdf, run_erc
+import pytest
 
+from kaicad.kicad.tasks import export_netlist, export_pdf, run_erc, run_post_apply_tasks
 
-def test_run_erc():
-    """Test that run_erc calls kicad-cli with correct arguments."""
-    test_sch = Path("/test/schematic.kicad_sch")
-    expected_out = Path("/test/schematic.erc.txt")
+# (task, kicad-cli subcommand, output suffix, trailing args)
+TASK_CASES = [
+    pytest.param(run_erc, ["erc"], ".erc.txt", ["--format", "report"], id="erc"),
+    pytest.param(export_netlist, ["export", "netlist"], ".net", [], id="netlist"),
+    pytest.param(export_pdf, ["export", "pdf"], ".pdf", [], id="pdf"),
+]
 
-    with patch("kaicad.kicad.tasks.subprocess.run") as mock_run:
-        run_erc(test_sch)
 
-        mock_run.assert_called_once_with(
-            ["kicad-cli", "sch", "erc", str(test_sch), "-o", str(expected_out), "--format", "report"], 
-            check=True, capture_output=True, text=True
-        )
+@pytest.fixture
+def mock_run():
+    """Patch subprocess.run in the tasks module for the duration of a test.
 
+    The kicad-cli availability probe is stubbed too, so the mock only records
+    the task's own kicad-cli invocation.
+    """
+    with (
+        patch("kaicad.kicad.tasks.check_kicad_cli", return_value=(True, "8.0.0")),
+        patch("kaicad.kicad.tasks.subprocess.run") as mock,
+    ):
+        yield mock
 
-def test_export_netlist():
-    """Test that export_netlist calls kicad-cli with correct arguments."""
-    test_sch = Path("/test/circuit.kicad_sch")
-    expected_out = Path("/test/circuit.net")
 
-    with patch("kaicad.kicad.tasks.subprocess.run") as mock_run:
-        export_netlist(test_sch)
-
-        mock_run.assert_called_once_with(
-            ["kicad-cli", "sch", "export", "netlist", str(test_sch), "-o", str(expected_out)], 
-            check=True, capture_output=True, text=True
-        )
-
-
-def test_export_pdf():
-    """Test that export_pdf calls kicad-cli with correct arguments."""
+@pytest.mark.parametrize("task,sub_cmd,out_suffix,extra_args", TASK_CASES)
+def test_task_calls_kicad_cli(mock_run, task, sub_cmd, out_suffix, extra_args):
+    """Test that each task calls kicad-cli with correct arguments and check=True (Bug #3 fix)."""
     test_sch = Path("/test/design.kicad_sch")
-    expected_out = Path("/test/design.pdf")
-
-    with patch("kaicad.kicad.tasks.subprocess.run") as mock_run:
-        export_pdf(test_sch)
-
-        mock_run.assert_called_once_with(
-            ["kicad-cli", "sch", "export", "pdf", str(test_sch), "-o", str(expected_out)], 
-            check=True, capture_output=True, text=True
-        )
-
-
-def test_run_erc_with_tempfile():
-    """Test run_erc with actual temporary file path."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        test_sch = Path(tmpdir) / "test.kicad_sch"
-        test_sch.touch()
-
-        with patch("kaicad.kicad.tasks.subprocess.run") as mock_run:
-            run_erc(test_sch)
-
-            # Verify output path construction
-            call_args = mock_run.call_args[0][0]
-            assert call_args[0] == "kicad-cli"
-            assert call_args[2] == "erc"
-            assert str(test_sch) in call_args
-            assert ".erc.txt" in call_args[5]
+    expected_out = test_sch.with_suffix(out_suffix)
 
+    task(test_sch)
 
-def test_export_netlist_with_tempfile():
-    """Test export_netlist with actual temporary file path."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        test_sch = Path(tmpdir) / "circuit.kicad_sch"
-        test_sch.touch()
+    mock_run.assert_called_once_with(
+        ["kicad-cli", "sch", *sub_cmd, str(test_sch), "-o", str(expected_out), *extra_args],
+        check=True, capture_output=True, text=True
+    )
 
-        with patch("kaicad.kicad.tasks.subprocess.run") as mock_run:
-            export_netlist(test_sch)
 
-            call_args = mock_run.call_args[0][0]
-            assert call_args[0] == "kicad-cli"
-            assert call_args[3] == "netlist"
-            assert ".net" in call_args[6]
+@pytest.mark.parametrize("task,sub_cmd,out_suffix,extra_args", TASK_CASES)
+def test_task_with_plain_path(mock_run, task, sub_cmd, out_suffix, extra_args):
+    """Test each task with a path that does not exist on disk (subprocess is mocked)."""
+    test_sch = Path("/tmp/fake/test.kicad_sch")
 
+    task(test_sch)
 
-def test_export_pdf_with_tempfile():
-    """Test export_pdf with actual temporary file path."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        test_sch = Path(tmpdir) / "design.kicad_sch"
-        test_sch.touch()
+    # Verify output path construction
+    call_args = mock_run.call_args[0][0]
+    assert call_args[0] == "kicad-cli"
+    assert call_args[2:2 + len(sub_cmd)] == sub_cmd
+    assert str(test_sch) in call_args
+    assert out_suffix in call_args[call_args.index("-o") + 1]
 
-        with patch("kaicad.kicad.tasks.subprocess.run") as mock_run:
-            export_pdf(test_sch)
 
-            call_args = mock_run.call_args[0][0]
-            assert call_args[0] == "kicad-cli"
-            assert call_args[3] == "pdf"
-            assert ".pdf" in call_args[6]
-
-
-def test_all_tasks_use_check_true():
-    """Test that all tasks use check=True to raise on kicad-cli errors (Bug #3 fix)."""
-    test_sch = Path("/test/test.kicad_sch")
-
-    with patch("kaicad.kicad.tasks.subprocess.run") as mock_run:
-        run_erc(test_sch)
-        assert mock_run.call_args[1]["check"] is True
-        assert mock_run.call_args[1]["capture_output"] is True
-        assert mock_run.call_args[1]["text"] is True
-
-        export_netlist(test_sch)
-        assert mock_run.call_args[1]["check"] is True
-        assert mock_run.call_args[1]["capture_output"] is True
-        assert mock_run.call_args[1]["text"] is True
-
-        export_pdf(test_sch)
-        assert mock_run.call_args[1]["check"] is True
-        assert mock_run.call_args[1]["capture_output"] is True
-        assert mock_run.call_args[1]["text"] is True
-
-
-def test_tasks_handle_different_extensions():
+@pytest.mark.parametrize("task,sub_cmd,out_suffix,extra_args", TASK_CASES)
+def test_task_handles_different_extensions(mock_run, task, sub_cmd, out_suffix, extra_args):
     """Test that tasks correctly replace file extensions."""
     # Test with .sch extension
     old_sch = Path("/test/old_format.sch")
 
-    with patch("kaicad.kicad.tasks.subprocess.run") as mock_run:
-        run_erc(old_sch)
-        call_args = mock_run.call_args[0][0]
-        # Check that output has .erc.txt extension (path separators may vary by platform)
-        assert "old_format.erc.txt" in str(call_args)
+    task(old_sch)
+    call_args = mock_run.call_args[0][0]
+    # Check the output extension (path separators may vary by platform)
+    assert f"old_format{out_suffix}" in str(call_args)
+
+
+def test_run_post_apply_tasks_probes_cli_once():
+    """Test that the batched tasks check kicad-cli once and run all three commands."""
+    test_sch = Path("/test/board.kicad_sch")
 
-        export_netlist(old_sch)
-        call_args = mock_run.call_args[0][0]
-        assert "old_format.net" in str(call_args)
+    with patch("kaicad.kicad.tasks.check_kicad_cli", return_value=(True, "9.0.0")) as mock_check, \
+            patch("kaicad.kicad.tasks.subprocess.run") as mock_run:
+        results = run_post_apply_tasks(test_sch)
 
-        export_pdf(old_sch)
-        call_args = mock_run.call_args[0][0]
-        assert "old_format.pdf" in str(call_args)
+        mock_check.assert_called_once_with()
+        assert len(results) == 3
+        commands = [c[0][0] for c in mock_run.call_args_list]
+        assert [cmd[2] for cmd in commands] == ["erc", "export", "export"]
+        assert [cmd[3] for cmd in commands[1:]] == ["netlist", "pdf"]
@@ -0,0 +1,135 @@
+"""Shared fixtures for the web UI tests"""
+
+import importlib
+from types import SimpleNamespace
+
+import pytest
+
+WEB_MODULE = "kaicad.ui.web.app"
+
+# Environment the shared app is created under
+_TEST_ENV = {"FLASK_ENV": "development", "FLASK_SECRET_KEY": "test-secret-key-for-testing"}
+
+# Module-level JSON state files the web app otherwise keeps in the working directory
+_STATE_FILES = ("RECENT_PROJECTS_FILE", "API_KEY_FILE", "CHAT_HISTORY_FILE", "PLAN_HISTORY_FILE", "CURRENT_PROJECT_FILE")
+
+
+class _InMemProjectFile:
+    """Stand-in for ``CURRENT_PROJECT_FILE`` holding its text in memory"""
+
+    def __init__(self, text=None):
+        self._buf = text
+        self._version = 0
+
+    def exists(self):
+        return self._buf is not None
+
+    def stat(self):
+        if self._buf is None:
+            raise FileNotFoundError("in-memory project file is empty")
+        # Every write bumps the "mtime" so the module's cache sees the change
+        return SimpleNamespace(st_mtime_ns=self._version, st_size=len(self._buf))
+
+    def read_text(self, encoding=None):
+        if self._buf is None:
+            raise FileNotFoundError("in-memory project file is empty")
+        return self._buf
+
+    def write_text(self, text, encoding=None):
+        self._buf = text
+        self._version += 1
+        return len(text)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def web_test_env():
+    """Development web configuration for the whole UI test session, undone afterwards"""
+    with pytest.MonkeyPatch.context() as mp:
+        for key, value in _TEST_ENV.items():
+            mp.setenv(key, value)
+        yield
+
+
+@pytest.fixture(scope="session")
+def web_state_dir(tmp_path_factory):
+    """Directory for the web app's state files; unique per xdist worker"""
+    return tmp_path_factory.mktemp("kaicad-state")
+
+
+@pytest.fixture(scope="module")
+def web_app_factory(web_module):
+    """Return ``make(env, secret)`` building the web app once per configuration.
+
+    Apps (or the RuntimeError raised while configuring) are cached per
+    ``(FLASK_ENV, FLASK_SECRET_KEY)`` so each one is built at most once per
+    test module. ``secret=None`` means the variable is unset.
+    """
+    cache = {}
+
+    def make(env="development", secret=None):
+        key = (env, secret)
+        if key not in cache:
+            with pytest.MonkeyPatch.context() as mp:
+                mp.setenv("FLASK_ENV", env)
+                if secret is None:
+                    mp.delenv("FLASK_SECRET_KEY", raising=False)
+                else:
+                    mp.setenv("FLASK_SECRET_KEY", secret)
+                try:
+                    cache[key] = web_module.create_app()
+                except RuntimeError as e:
+                    cache[key] = e
+        result = cache[key]
+        if isinstance(result, RuntimeError):
+            raise result
+        return result
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def web_module(web_state_dir):
+    """The web app module.
+
+    Its state files point into ``web_state_dir`` so tests never write to the
+    working directory and parallel workers never share them.
+    """
+    module = importlib.import_module(WEB_MODULE)
+    with pytest.MonkeyPatch.context() as mp:
+        for name in _STATE_FILES:
+            mp.setattr(module, name, web_state_dir / getattr(module, name).name)
+        yield module
+
+
+@pytest.fixture(scope="session")
+def app(web_module):
+    """Single app shared by the route tests, in testing mode with CSRF disabled"""
+    app = web_module.create_app()
+    app.config["TESTING"] = True
+    app.config["WTF_CSRF_ENABLED"] = False
+    return app
+
+
+@pytest.fixture(scope="session")
+def route_set(app):
+    """URL rules registered on the shared app, collected once"""
+    return frozenset(rule.rule for rule in app.url_map.iter_rules())
+
+
+@pytest.fixture
+def client(app):
+    """Test client for the shared app with a fresh app context per test"""
+    with app.app_context(), app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def memory_project_file(web_module, monkeypatch):
+    """Swap ``CURRENT_PROJECT_FILE`` for an empty in-memory file.
+
+    For tests of the current-project logic that don't care about disk
+    persistence; tests checking the on-disk format point it at ``tmp_path``.
+    """
+    project_file = _InMemProjectFile()
+    monkeypatch.setattr(web_module, "CURRENT_PROJECT_FILE", project_file)
+    return project_file
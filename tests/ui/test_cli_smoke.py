@@ -3,24 +3,35 @@
 import subprocess
 import sys
 
+import pytest
 
-def run_cmd(args: list[str]) -> subprocess.CompletedProcess:
-    return subprocess.run(
-        args,
+from kaicad.ui.cli import build_parser as build_cli_parser
+
+
+def run_help(build_parser, capsys) -> str:
+    """Parse ``-h`` in-process with the given entrypoint parser and return the printed help"""
+    with pytest.raises(SystemExit) as exc_info:
+        build_parser().parse_args(["-h"])
+    assert exc_info.value.code == 0
+    return capsys.readouterr().out
+
+
+def test_cli_main_help(capsys):
+    assert "kAIcad CLI" in run_help(build_cli_parser, capsys)
+
+
+def test_cli_web_help(web_module, capsys):
+    assert "kAIcad Web GUI" in run_help(web_module.build_parser, capsys)
+
+
+@pytest.mark.slow
+def test_cli_main_help_subprocess():
+    cp = subprocess.run(
+        [sys.executable, "-m", "kaicad.ui.cli", "-h"],
         capture_output=True,
         text=True,
         timeout=10,
         check=False,
     )
-
-
-def test_cli_main_help():
-    cp = run_cmd([sys.executable, "-m", "kaicad.ui.cli", "-h"])
     assert cp.returncode == 0
     assert "kAIcad CLI" in cp.stdout
-
-
-def test_cli_web_help():
-    cp = run_cmd([sys.executable, "-m", "kaicad.ui.web.app", "-h"])
-    assert cp.returncode == 0
-    assert "kAIcad Web GUI" in cp.stdout
@@ -0,0 +1,41 @@
+"""Shared fixtures for the unit tests"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from kaicad.config.settings import Settings
+from kaicad.core.planner_v2 import _demo_plan
+
+
+@pytest.fixture(scope="session")
+def base_settings():
+    """Settings with a test API key for the planner tests.
+
+    Shared across the session, so tests must not mutate it; derive variants
+    with ``dataclasses.replace(base_settings, ...)``.
+    """
+    return Settings(
+        openai_model="gpt-4o-mini",
+        openai_temperature=0.0,
+        openai_api_key="sk-test-key",
+        default_project="",
+        dock_right=True,
+    )
+
+
+@pytest.fixture
+def mock_openai_client(monkeypatch):
+    """Mock client returned by every ``openai.OpenAI(...)`` call in the test.
+
+    Tests configure ``responses.create`` / ``chat.completions.create`` on it.
+    """
+    client = MagicMock()
+    monkeypatch.setattr("openai.OpenAI", lambda *args, **kwargs: client)
+    return client
+
+
+@pytest.fixture(scope="class")
+def demo_plan():
+    """Demo plan built once per test class; tests only read it"""
+    return _demo_plan()
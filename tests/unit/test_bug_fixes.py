@@ -118,6 +118,13 @@ class TestWireValidation:
         assert not is_valid
         assert "empty" in error.lower()
 
+    def test_repeated_specs_served_from_cache(self):
+        """Repeated wire specs should hit the cache and return the same result"""
+        validate_wire_format.cache_clear()
+        first = validate_wire_format("R1:1")
+        assert validate_wire_format("R1:1") is first
+        assert validate_wire_format.cache_info().hits == 1
+
 
 class TestCoordinateValidation:
     """Test Bug #11 fix - Type confusion in coordinates"""
@@ -194,11 +201,6 @@ class TestCoordinateValidation:
 class TestAPIKeyMasking:
     """Test Bug #3 fix - API key masking logic"""
 
-    @pytest.fixture(autouse=True)
-    def setup_flask_env(self, monkeypatch):
-        """Set up Flask environment for testing"""
-        monkeypatch.setenv("FLASK_ENV", "development")
-
     def test_long_key_masked_correctly(self):
         """Long API keys should show first 7 and last 4 characters"""
         from kaicad.ui.web.app import _mask_api_key
@@ -1,6 +1,5 @@
 """Tests for keychain storage security."""
 
-import os
 import pytest
 from unittest.mock import patch, MagicMock
 from pathlib import Path
@@ -38,68 +37,86 @@ def test_keyring_stores_api_key_when_available():
                         assert config_data.get("openai_api_key") == ""
 
 
-def test_keyring_loads_api_key_when_available():
+def test_keyring_loads_api_key_when_available(monkeypatch):
     """Test that API key is loaded from keyring when available."""
     if not KEYRING_AVAILABLE:
         pytest.skip("Keyring not available")
     
     # Ensure env var is not set
-    old_key = os.environ.pop("OPENAI_API_KEY", None)
-    try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "config.json"
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = Path(tmpdir) / "config.json"
             
-            with patch("kaicad.config.settings.CONFIG_PATH", config_path):
-                with patch("kaicad.config.settings.KEYRING_AVAILABLE", True):
-                    with patch("kaicad.config.settings.keyring") as mock_keyring:
-                        # Mock keyring returning stored key
-                        mock_keyring.get_password.return_value = "sk-from-keyring"
+        with patch("kaicad.config.settings.CONFIG_PATH", config_path):
+            with patch("kaicad.config.settings.KEYRING_AVAILABLE", True):
+                with patch("kaicad.config.settings.keyring") as mock_keyring:
+                    # Mock keyring returning stored key
+                    mock_keyring.get_password.return_value = "sk-from-keyring"
                         
-                        # Load settings
-                        settings = Settings.load()
+                    # Load settings
+                    settings = Settings.load()
                         
-                        # Verify keyring was queried
-                        mock_keyring.get_password.assert_called_once_with(
-                            "kAIcad",
-                            "openai_api_key"
-                        )
+                    # Verify keyring was queried
+                    mock_keyring.get_password.assert_called_once_with(
+                        "kAIcad",
+                        "openai_api_key"
+                    )
                         
-                        # Verify API key loaded from keyring
-                        assert settings.openai_api_key == "sk-from-keyring"
-    finally:
-        if old_key:
-            os.environ["OPENAI_API_KEY"] = old_key
+                    # Verify API key loaded from keyring
+                    assert settings.openai_api_key == "sk-from-keyring"
 
 
-def test_fallback_to_config_file_when_keyring_unavailable():
+def test_fallback_to_config_file_when_keyring_unavailable(monkeypatch):
     """Test that API key falls back to config file when keyring unavailable."""
     # Remove env var so config file is used
-    old_key = os.environ.pop("OPENAI_API_KEY", None)
-    try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "config.json"
-            config_path.parent.mkdir(parents=True, exist_ok=True)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = Path(tmpdir) / "config.json"
+        config_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Create config with API key
-            config_data = {
-                "openai_model": "gpt-4o-mini",
-                "openai_temperature": 0.0,
-                "openai_api_key": "sk-from-config-file",
-                "default_project": str(Path.cwd()),
-                "dock_right": True
-            }
-            config_path.write_text(json.dumps(config_data))
+        # Create config with API key
+        config_data = {
+            "openai_model": "gpt-4o-mini",
+            "openai_temperature": 0.0,
+            "openai_api_key": "sk-from-config-file",
+            "default_project": str(Path.cwd()),
+            "dock_right": True
+        }
+        config_path.write_text(json.dumps(config_data))
             
-            with patch("kaicad.config.settings.CONFIG_PATH", config_path):
-                with patch("kaicad.config.settings.KEYRING_AVAILABLE", False):
-                    # Load settings
-                    settings = Settings.load()
+        with patch("kaicad.config.settings.CONFIG_PATH", config_path):
+            with patch("kaicad.config.settings.KEYRING_AVAILABLE", False):
+                # Load settings
+                settings = Settings.load()
                     
-                    # Verify API key loaded from config file
-                    assert settings.openai_api_key == "sk-from-config-file"
-    finally:
-        if old_key:
-            os.environ["OPENAI_API_KEY"] = old_key
+                # Verify API key loaded from config file
+                assert settings.openai_api_key == "sk-from-config-file"
+
+
+def test_keyring_queried_once_until_saved_or_reloaded(monkeypatch):
+    """Test that repeated loads reuse the keyring lookup until save() or reload()."""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = Path(tmpdir) / "config.json"
+
+        with patch("kaicad.config.settings.CONFIG_DIR", Path(tmpdir)), \
+                patch("kaicad.config.settings.CONFIG_PATH", config_path), \
+                patch("kaicad.config.settings.KEYRING_AVAILABLE", True), \
+                patch("kaicad.config.settings.keyring") as mock_keyring:
+            mock_keyring.get_password.return_value = "sk-from-keyring"
+
+            Settings.load()
+            assert Settings.load().openai_api_key == "sk-from-keyring"
+            assert mock_keyring.get_password.call_count == 1
+
+            # Saving a new key invalidates the cached lookup
+            mock_keyring.get_password.return_value = "sk-new-key"
+            Settings(openai_api_key="sk-new-key").save()
+            assert Settings.load().openai_api_key == "sk-new-key"
+            assert mock_keyring.get_password.call_count == 2
+
+            Settings.reload()
+            assert mock_keyring.get_password.call_count == 3
 
 
 def test_no_plaintext_storage_with_keyring():
@@ -142,27 +159,19 @@ def test_keyring_error_graceful_fallback():
                     settings.save()  # Should complete without error
 
 
-def test_env_var_takes_precedence():
+def test_env_var_takes_precedence(monkeypatch):
     """Test that environment variable takes precedence over keyring/config."""
-    old_key = os.environ.get("OPENAI_API_KEY")
-    try:
-        os.environ["OPENAI_API_KEY"] = "sk-from-env"
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "config.json"
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-from-env")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = Path(tmpdir) / "config.json"
             
-            with patch("kaicad.config.settings.CONFIG_PATH", config_path):
-                with patch("kaicad.config.settings.KEYRING_AVAILABLE", True):
-                    with patch("kaicad.config.settings.keyring") as mock_keyring:
-                        mock_keyring.get_password.return_value = "sk-from-keyring"
+        with patch("kaicad.config.settings.CONFIG_PATH", config_path):
+            with patch("kaicad.config.settings.KEYRING_AVAILABLE", True):
+                with patch("kaicad.config.settings.keyring") as mock_keyring:
+                    mock_keyring.get_password.return_value = "sk-from-keyring"
                         
-                        # Load settings
-                        settings = Settings.load()
+                    # Load settings
+                    settings = Settings.load()
                         
-                        # Verify env var takes precedence
-                        assert settings.openai_api_key == "sk-from-env"
-    finally:
-        if old_key:
-            os.environ["OPENAI_API_KEY"] = old_key
-        else:
-            os.environ.pop("OPENAI_API_KEY", None)
+                    # Verify env var takes precedence
+                    assert settings.openai_api_key == "sk-from-env"
@@ -1,10 +1,14 @@
 """Tests for KiCad version detection."""
 
+from unittest.mock import patch
+
 import pytest
 from kaicad.kicad.version import (
     KiCadVersion,
     parse_kicad_version,
+    check_kicad_cli,
     check_kicad_tools,
+    clear_kicad_cli_cache,
 )
 
 
@@ -65,6 +69,20 @@ def test_check_kicad_tools():
     assert isinstance(result["warnings"], list)
 
 
+def test_check_kicad_cli_reuses_probe_within_ttl():
+    """Test repeated checks spawn kicad-cli once until the cache is cleared."""
+    with patch("kaicad.kicad.version.subprocess.run") as mock_run:
+        mock_run.return_value.stdout = "9.0.0\n"
+
+        assert check_kicad_cli() == (True, "9.0.0")
+        check_kicad_tools()
+        assert mock_run.call_count == 1
+
+        clear_kicad_cli_cache()
+        check_kicad_cli()
+        assert mock_run.call_count == 2
+
+
 def test_kicad_version_comparison():
     """Test version string representation."""
     v1 = KiCadVersion(major=7, minor=0, patch=10, raw="7.0.10")
@@ -76,6 +94,20 @@ def test_kicad_version_comparison():
     assert v1.major < v2.major
     assert v2.minor > v1.minor
 
+    # Versions order numerically, not by their raw strings
+    assert v1 < v2
+    assert KiCadVersion(major=7, minor=0, patch=9, raw="7.0.9") < v1
+    assert not v2 < v1
+    assert v1 <= v2 and v2 >= v1
+    assert v1 <= v1 and v1 >= v1
+
+    # The raw string doesn't take part in equality or ordering
+    plain = KiCadVersion(major=8, minor=0, patch=1, raw="8.0.1")
+    decorated = KiCadVersion(major=8, minor=0, patch=1, raw="8.0.1 (x)")
+    assert plain == decorated
+    assert not plain < decorated and not decorated < plain
+    assert plain <= decorated and plain >= decorated
+
 
 def test_parse_kicad_version_various_formats():
     """Test parsing different version format variations."""
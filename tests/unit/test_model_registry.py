@@ -8,7 +8,7 @@ def test_model_registry_get_available_models():
     """Test that ModelRegistry returns available models."""
     models = ModelRegistry.get_available_models()
     
-    assert isinstance(models, list)
+    assert isinstance(models, tuple)
     assert len(models) > 0
     # Should contain real models
     assert any("gpt-4" in m for m in models)
@@ -18,7 +18,7 @@ def test_model_registry_get_planning_models():
     """Test that planning models support JSON mode."""
     models = ModelRegistry.get_available_models_for_planning()
     
-    assert isinstance(models, list)
+    assert isinstance(models, tuple)
     assert len(models) > 0
     # All should be valid models
     for model in models:
@@ -31,7 +31,7 @@ def test_model_registry_get_chat_models():
     """Test that chat models are returned."""
     models = ModelRegistry.get_available_models_for_chat()
     
-    assert isinstance(models, list)
+    assert isinstance(models, tuple)
     assert len(models) > 0
 
 
@@ -82,9 +82,12 @@ def test_model_registry_caching():
     models1 = ModelRegistry.get_available_models()
     models2 = ModelRegistry.get_available_models()
     
-    # Should return same list (cached)
+    # Should return same tuple (cached)
     assert models1 is models2
 
+    # The planning subset is derived once and reused as well
+    assert ModelRegistry.get_available_models_for_planning() is ModelRegistry.get_available_models_for_planning()
+
 
 def test_model_registry_no_fantasy_models():
     """Test that fantasy models (gpt-5, etc.) are not in the registry."""
@@ -1,5 +1,9 @@
 """Tests for models module - OpenAI model registry and validation."""
 
+import dataclasses
+
+import pytest
+
 from kaicad.core.models import (
     _MODEL_REGISTRY,
     ModelConfig,
@@ -35,6 +39,16 @@ def test_model_config_creation():
     assert config.description == "Test model"
 
 
+def test_model_config_is_immutable():
+    """Test that registry configs cannot be mutated by callers."""
+    config = get_model_config("gpt-4o-mini")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.max_tokens = 1
+
+    assert not hasattr(config, "__dict__")
+
+
 def test_model_config_is_valid():
     """Test ModelConfig.is_valid property."""
     valid_config = ModelConfig(
@@ -1,21 +1,35 @@
 """Test Plan schema serialization and deserialization (round-trip)."""
 
-import json
-
 import pytest
+from pydantic import TypeAdapter, ValidationError
 
 from kaicad.schema.plan import PLAN_SCHEMA_VERSION, Plan
+from tests.conftest import PLAN_CORPUS
+
+_PLAN_TA = TypeAdapter(Plan)
+
+
+@pytest.mark.parametrize("name", list(PLAN_CORPUS))
+def test_plan_corpus_roundtrip(validated_plans, name):
+    """Test every corpus plan serializes with aliases and validates back to an equal Plan."""
+    plan_data = PLAN_CORPUS[name]
+    plan = validated_plans[name]
+
+    # Serialize (by_alias ensures field names match schema)
+    serialized = plan.model_dump(mode="json", by_alias=True)
+
+    # Round-trip should preserve core data (ignoring defaults like constraints)
+    assert serialized["plan_version"] == plan_data["plan_version"]
+    assert [op["op"] for op in serialized["ops"]] == [op["op"] for op in plan_data["ops"]]
+    assert _PLAN_TA.validate_python(serialized) == plan
 
 
-def test_plan_roundtrip_basic():
+def test_plan_roundtrip_basic(validated_plans):
     """Test basic Plan JSON round-trip with minimal operations."""
-    plan_data = {
-        "plan_version": PLAN_SCHEMA_VERSION,
-        "ops": [{"op": "add_component", "ref": "R1", "symbol": "Device:R", "value": "1k", "at": [100, 100], "rot": 0}],
-    }
+    plan_data = PLAN_CORPUS["basic"]
 
     # Deserialize
-    plan = Plan.model_validate(plan_data)
+    plan = validated_plans["basic"]
 
     # Verify
     assert plan.plan_version == PLAN_SCHEMA_VERSION
@@ -23,30 +37,16 @@ def test_plan_roundtrip_basic():
     assert plan.ops[0].op == "add_component"
     assert plan.ops[0].ref == "R1"
 
-    # Serialize (by_alias ensures field names match schema)
-    serialized = json.loads(plan.model_dump_json(by_alias=True))
-
-    # Round-trip should match (ignoring defaults like constraints)
-    assert serialized["plan_version"] == plan_data["plan_version"]
-    assert len(serialized["ops"]) == len(plan_data["ops"])
-    assert serialized["ops"][0]["op"] == plan_data["ops"][0]["op"]
+    serialized = plan.model_dump(mode="json", by_alias=True)
     assert serialized["ops"][0]["ref"] == plan_data["ops"][0]["ref"]
 
 
-def test_plan_roundtrip_complex():
+def test_plan_roundtrip_complex(validated_plans):
     """Test Plan round-trip with multiple operation types."""
-    plan_data = {
-        "plan_version": PLAN_SCHEMA_VERSION,
-        "ops": [
-            {"op": "add_component", "ref": "R1", "symbol": "Device:R", "value": "10k", "at": [80, 50], "rot": 0},
-            {"op": "add_component", "ref": "D1", "symbol": "Device:LED", "value": "RED", "at": [120, 50], "rot": 90},
-            {"op": "wire", "from": "R1:2", "to": "D1:A"},
-            {"op": "label", "net": "LED_CATHODE", "at": [120, 46]},
-        ],
-    }
+    plan_data = PLAN_CORPUS["complex"]
 
     # Deserialize
-    plan = Plan.model_validate(plan_data)
+    plan = validated_plans["complex"]
 
     # Verify structure
     assert plan.plan_version == PLAN_SCHEMA_VERSION
@@ -58,36 +58,26 @@ def test_plan_roundtrip_complex():
     assert plan.ops[2].op == "wire"
     assert plan.ops[3].op == "label"
 
-    # Serialize
-    serialized = json.loads(plan.model_dump_json(by_alias=True))
-
-    # Round-trip should preserve core data
-    assert serialized["plan_version"] == plan_data["plan_version"]
-    assert len(serialized["ops"]) == len(plan_data["ops"])
+    serialized = plan.model_dump(mode="json", by_alias=True)
+    assert serialized["ops"][2]["from"] == plan_data["ops"][2]["from"]
 
 
-def test_plan_empty_ops():
+def test_plan_empty_ops(validated_plans):
     """Test Plan with no operations."""
-    plan_data = {"plan_version": PLAN_SCHEMA_VERSION, "ops": []}
+    plan_data = PLAN_CORPUS["empty_ops"]
 
-    plan = Plan.model_validate(plan_data)
+    plan = validated_plans["empty_ops"]
     assert len(plan.ops) == 0
 
-    serialized = json.loads(plan.model_dump_json(by_alias=True))
-    assert serialized["plan_version"] == plan_data["plan_version"]
+    serialized = plan.model_dump(mode="json", by_alias=True)
     assert serialized["ops"] == plan_data["ops"]
     # Note: constraints field may be added as default, that's okay
 
 
-def test_plan_invalid_version():
+def test_plan_invalid_version(validated_plans):
     """Test Plan rejects invalid version."""
-    plan_data = {
-        "plan_version": 999,  # Invalid version
-        "ops": [],
-    }
-
     # Should still parse (version is just an int)
-    plan = Plan.model_validate(plan_data)
+    plan = validated_plans["unknown_version"]
     assert plan.plan_version == 999
 
 
@@ -100,46 +90,47 @@ def test_plan_missing_required_fields():
     }
 
     with pytest.raises(Exception):  # Pydantic ValidationError
-        Plan.model_validate(plan_data)
+        _PLAN_TA.validate_python(plan_data)
+
+
+def test_plan_ops_dispatch_on_op_tag():
+    """Test op validation reports errors against the tagged model only."""
+    plan_data = {"plan_version": PLAN_SCHEMA_VERSION, "ops": [{"op": "wire", "from": "R1:1"}]}
+    with pytest.raises(ValidationError) as exc_info:
+        _PLAN_TA.validate_python(plan_data)
+    errors = exc_info.value.errors()
+    assert len(errors) == 1
+    assert errors[0]["loc"] == ("ops", 0, "wire", "to")
+
+    plan_data["ops"][0] = {"op": "move", "ref": "R1"}
+    with pytest.raises(ValidationError) as exc_info:
+        _PLAN_TA.validate_python(plan_data)
+    assert exc_info.value.errors()[0]["type"] == "union_tag_invalid"
 
 
 def test_plan_json_string_roundtrip():
     """Test Plan can be serialized to and from JSON string."""
-    plan_data = {"plan_version": PLAN_SCHEMA_VERSION, "ops": [{"op": "wire", "from": "R1:1", "to": "R2:2"}]}
+    plan_json = f'{{"plan_version": {PLAN_SCHEMA_VERSION}, "ops": [{{"op": "wire", "from": "R1:1", "to": "R2:2"}}]}}'
 
-    # From dict
-    plan = Plan.model_validate(plan_data)
+    # From JSON text, as returned by the LLM
+    plan = _PLAN_TA.validate_json(plan_json)
 
     # To JSON string
     json_str = plan.model_dump_json(by_alias=True)
 
     # From JSON string
-    plan2 = Plan.model_validate_json(json_str)
+    plan2 = _PLAN_TA.validate_json(json_str)
 
     # Should be equivalent
-    assert plan.model_dump() == plan2.model_dump()
+    assert plan2.model_dump_json(by_alias=True) == json_str
 
 
-def test_plan_coordinate_types():
+def test_plan_coordinate_types(validated_plans):
     """Test Plan handles coordinate as list of numbers."""
-    plan_data = {
-        "plan_version": PLAN_SCHEMA_VERSION,
-        "ops": [
-            {
-                "op": "add_component",
-                "ref": "C1",
-                "symbol": "Device:C",
-                "value": "100nF",
-                "at": [123.45, 67.89],  # Float coordinates
-                "rot": 180,
-            }
-        ],
-    }
-
-    plan = Plan.model_validate(plan_data)
+    plan = validated_plans["float_coordinates"]
     assert plan.ops[0].at == (123.45, 67.89)  # Tuple internally
 
-    serialized = json.loads(plan.model_dump_json(by_alias=True))
+    serialized = plan.model_dump(mode="json", by_alias=True)
     assert serialized["ops"][0]["at"] == [123.45, 67.89]  # List when serialized
 
 
@@ -1,6 +1,5 @@
 """Tests for planner module."""
 
-import json
 import os
 from unittest.mock import patch
 
@@ -35,42 +34,24 @@ def test_plan_from_prompt_no_api_key():
         assert len(result.diagnostics) > 0
 
         # Check for warning about missing API key
-        warning = next((d for d in result.diagnostics if d.severity == "warning"), None)
+        warning = result.first_diagnostic("warning")
         assert warning is not None
         assert "OPENAI_API_KEY" in warning.message
 
 
-def test_plan_from_prompt_with_deprecated_kai_model():
+def test_plan_from_prompt_with_deprecated_kai_model(monkeypatch):
     """Test that using KAI_MODEL env var triggers deprecation warning."""
-    # Need to temporarily remove OPENAI_API_KEY and set KAI_MODEL
-    original_key = os.environ.get("OPENAI_API_KEY")
-    original_model = os.environ.get("OPENAI_MODEL")
-    original_kai = os.environ.get("KAI_MODEL")
-
-    try:
-        os.environ["OPENAI_API_KEY"] = "sk-test-key"  # Need key to get past early return
-        if "OPENAI_MODEL" in os.environ:
-            del os.environ["OPENAI_MODEL"]
-        os.environ["KAI_MODEL"] = "gpt-4o"
-
-        result = plan_from_prompt("Test prompt")
-
-        # Should have deprecation warning
-        deprecation_warning = next((d for d in result.diagnostics if "deprecated" in d.message.lower()), None)
-        assert deprecation_warning is not None
-        assert "KAI_MODEL" in deprecation_warning.message
-    finally:
-        # Restore
-        if original_key:
-            os.environ["OPENAI_API_KEY"] = original_key
-        if original_model:
-            os.environ["OPENAI_MODEL"] = original_model
-        elif "OPENAI_MODEL" in os.environ:
-            del os.environ["OPENAI_MODEL"]
-        if original_kai:
-            os.environ["KAI_MODEL"] = original_kai
-        elif "KAI_MODEL" in os.environ:
-            del os.environ["KAI_MODEL"]
+    # Need key to get past early return
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("KAI_MODEL", "gpt-4o")
+    monkeypatch.delenv("OPENAI_MODEL", raising=False)
+
+    result = plan_from_prompt("Test prompt")
+
+    # Should have deprecation warning
+    deprecation_warning = next((d for d in result.diagnostics if "deprecated" in d.message.lower()), None)
+    assert deprecation_warning is not None
+    assert "KAI_MODEL" in deprecation_warning.message
 
 
 def test_plan_from_prompt_invalid_model():
@@ -79,7 +60,7 @@ def test_plan_from_prompt_invalid_model():
         result = plan_from_prompt("Add component")
 
         # Should have error diagnostic about invalid model
-        error = next((d for d in result.diagnostics if d.severity == "error"), None)
+        error = result.first_diagnostic("error")
         assert error is not None
         assert "model" in error.message.lower() or "supported" in error.message.lower()
 
@@ -123,7 +104,6 @@ def test_plan_serialization():
     assert isinstance(json_str, str)
 
     # Should be deserializable
-    data = json.loads(json_str)
-    reloaded = Plan.model_validate(data)
+    reloaded = Plan.model_validate_json(json_str)
     assert reloaded.plan_version == plan.plan_version
     assert len(reloaded.ops) == len(plan.ops)
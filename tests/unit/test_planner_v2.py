@@ -1,58 +1,95 @@
 """Tests for the enhanced planner_v2 module."""
 
 import json
-import os
-from unittest.mock import MagicMock, patch
+import sys
+from dataclasses import replace
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
-
-from kaicad.config.settings import Settings
-from kaicad.core.planner_v2 import _demo_plan, _snap_to_grid, plan_from_prompt, KICAD_GRID_MM
+from openai.types.chat import ChatCompletion, ChatCompletionMessage
+from openai.types.chat.chat_completion import Choice
+
+from kaicad.core.planner_v2 import (
+    KICAD_GRID_MM,
+    _chat_api_text,
+    _responses_api_text,
+    _snap_to_grid,
+    plan_from_prompt,
+)
 from kaicad.schema.plan import Plan
 
+# Single-resistor plan shared by the mocked API responses; only the immutable
+# JSON text is kept so no test can mutate it for another
+_MOCK_PLAN_JSON = json.dumps(
+    {
+        "plan_version": 1,
+        "ops": [{"op": "add_component", "ref": "R1", "symbol": "Device:R", "value": "1k", "at": [80, 50], "rot": 0}],
+    }
+)
+
+
+def _has_diag(diagnostics, severity, needle):
+    """True if any diagnostic of ``severity`` mentions ``needle``"""
+    for d in diagnostics:
+        if d.severity == severity and needle in d.message:
+            return True
+    return False
+
+
+def _responses_output(body):
+    """Responses API result carrying ``body`` as its output text"""
+    return SimpleNamespace(output_text=body)
+
+
+def _chat_completion(body):
+    """Chat Completions result with a single assistant message ``body``"""
+    return ChatCompletion(
+        id="x",
+        model="gpt-4o-mini",
+        object="chat.completion",
+        created=0,
+        choices=[
+            Choice(
+                finish_reason="stop",
+                index=0,
+                message=ChatCompletionMessage(role="assistant", content=body),
+            )
+        ],
+    )
+
 
 class TestGridSnapping:
     """Test grid snapping functionality."""
 
-    def test_snap_to_grid_exact(self):
-        """Test snapping coordinates that are already on grid."""
-        x, y = _snap_to_grid(1.27, 2.54)
-        assert x == 1.27
-        assert y == 2.54
-
-    def test_snap_to_grid_round_down(self):
-        """Test snapping coordinates that round down."""
-        x, y = _snap_to_grid(1.0, 2.0, grid=KICAD_GRID_MM)
-        assert abs(x - 1.27) < 0.01
-        assert abs(y - 2.54) < 0.01
-
-    def test_snap_to_grid_round_up(self):
-        """Test snapping coordinates that round up."""
-        x, y = _snap_to_grid(1.5, 3.0, grid=KICAD_GRID_MM)
-        assert abs(x - 1.27) < 0.01
-        assert abs(y - 2.54) < 0.01
-
-    def test_snap_to_grid_custom_grid(self):
-        """Test snapping with custom grid size."""
-        x, y = _snap_to_grid(5.5, 7.8, grid=2.0)
-        assert x == 6.0
-        assert y == 8.0
+    @pytest.mark.parametrize(
+        "x,y,grid,ex,ey",
+        [
+            pytest.param(1.27, 2.54, KICAD_GRID_MM, 1.27, 2.54, id="exact"),
+            pytest.param(1.0, 2.0, KICAD_GRID_MM, 1.27, 2.54, id="round_up"),
+            pytest.param(1.5, 3.0, KICAD_GRID_MM, 1.27, 2.54, id="round_down"),
+            pytest.param(5.5, 7.8, 2.0, 6.0, 8.0, id="custom_grid"),
+        ],
+    )
+    def test_snap_to_grid(self, x, y, grid, ex, ey):
+        """Test snapping coordinates to the KiCad grid and to a custom grid."""
+        rx, ry = _snap_to_grid(x, y, grid=grid)
+        assert abs(rx - ex) < 1e-9
+        assert abs(ry - ey) < 1e-9
 
 
 class TestDemoPlan:
     """Test demo plan generation."""
 
-    def test_demo_plan_valid(self):
+    def test_demo_plan_valid(self, demo_plan):
         """Test that demo plan is valid."""
-        plan = _demo_plan()
-        assert isinstance(plan, Plan)
-        assert plan.plan_version == 1
-        assert len(plan.ops) > 0
+        assert isinstance(demo_plan, Plan)
+        assert demo_plan.plan_version == 1
+        assert len(demo_plan.ops) > 0
 
-    def test_demo_plan_has_led_circuit(self):
+    def test_demo_plan_has_led_circuit(self, demo_plan):
         """Test that demo plan contains LED circuit components."""
-        plan = _demo_plan()
-        refs = [op.ref for op in plan.ops if hasattr(op, "ref")]
+        refs = [op.ref for op in demo_plan.ops if hasattr(op, "ref")]
         assert "R1" in refs
         assert "D1" in refs
 
@@ -60,15 +97,9 @@ class TestDemoPlan:
 class TestPlanFromPromptNoAPIKey:
     """Test plan_from_prompt when no API key is available."""
 
-    def test_no_api_key_returns_demo_plan(self):
+    def test_no_api_key_returns_demo_plan(self, base_settings):
         """Test that missing API key returns demo plan with warning."""
-        settings = Settings(
-            openai_model="gpt-4o-mini",
-            openai_temperature=0.0,
-            openai_api_key="",  # No API key
-            default_project="",
-            dock_right=True
-        )
+        settings = replace(base_settings, openai_api_key="")
 
         result = plan_from_prompt("Add LED", settings=settings)
 
@@ -77,257 +108,127 @@ class TestPlanFromPromptNoAPIKey:
         assert result.diagnostics[0].severity == "warning"
         assert "No OpenAI API key" in result.diagnostics[0].message
 
-    def test_no_settings_loads_from_config(self):
+    def test_no_settings_loads_from_config(self, base_settings, monkeypatch):
         """Test that plan_from_prompt loads settings if not provided."""
         # Remove env var so config is used
-        old_key = os.environ.pop("OPENAI_API_KEY", None)
-        try:
-            with patch("kaicad.core.planner_v2.Settings.load") as mock_load:
-                mock_settings = Settings(
-                    openai_model="gpt-4o-mini",
-                    openai_temperature=0.0,
-                    openai_api_key="",
-                    default_project="",
-                    dock_right=True
-                )
-                mock_load.return_value = mock_settings
-
-                result = plan_from_prompt("Add LED")
-
-                mock_load.assert_called_once()
-                assert result.plan is not None
-        finally:
-            if old_key:
-                os.environ["OPENAI_API_KEY"] = old_key
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        loads = []
 
+        def fake_load():
+            loads.append(True)
+            return replace(base_settings, openai_api_key="")
 
-class TestPlanFromPromptWithMockAPI:
-    """Test plan_from_prompt with mocked OpenAI API."""
+        monkeypatch.setattr("kaicad.core.planner_v2.Settings.load", fake_load)
 
-    def test_successful_plan_generation_responses_api(self):
-        """Test successful plan generation using Responses API."""
-        settings = Settings(
-            openai_model="gpt-4o-mini",
-            openai_temperature=0.0,
-            openai_api_key="sk-test-key",
-            default_project="",
-            dock_right=True
-        )
-
-        mock_plan = {
-            "plan_version": 1,
-            "ops": [
-                {"op": "add_component", "ref": "R1", "symbol": "Device:R", "value": "1k", "at": [80, 50], "rot": 0}
-            ]
-        }
-
-        with patch("openai.OpenAI") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
-
-            # Mock Responses API
-            mock_response = MagicMock()
-            mock_response.output_text = json.dumps(mock_plan)
-            mock_client.responses.create.return_value = mock_response
-
-            result = plan_from_prompt("Add resistor", settings=settings)
-
-            assert result.plan is not None
-            assert len(result.plan.ops) == 1
-            assert result.diagnostics[0].severity == "info"
-            assert "Responses API" in result.diagnostics[0].message
-
-    def test_successful_plan_generation_chat_api(self):
-        """Test successful plan generation using Chat API fallback."""
-        settings = Settings(
-            openai_model="gpt-4o-mini",
-            openai_temperature=0.0,
-            openai_api_key="sk-test-key",
-            default_project="",
-            dock_right=True
-        )
-
-        mock_plan = {
-            "plan_version": 1,
-            "ops": [
-                {"op": "add_component", "ref": "D1", "symbol": "Device:LED", "value": "RED", "at": [100, 50], "rot": 0}
-            ]
-        }
-
-        with patch("openai.OpenAI") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
+        result = plan_from_prompt("Add LED")
 
-            # Responses API fails, Chat API succeeds
-            mock_client.responses.create.side_effect = Exception("Responses API not available")
+        assert len(loads) == 1
+        assert result.plan is not None
 
-            mock_choice = MagicMock()
-            mock_choice.message.content = json.dumps(mock_plan)
-            mock_completion = MagicMock()
-            mock_completion.choices = [mock_choice]
-            mock_client.chat.completions.create.return_value = mock_completion
 
-            result = plan_from_prompt("Add LED", settings=settings)
+class TestOpenAICallHelpers:
+    """Test the thin wrappers around the two OpenAI endpoints."""
 
-            assert result.plan is not None
-            assert len(result.plan.ops) == 1
-            assert result.diagnostics[0].severity == "info"
-            assert "Chat API" in result.diagnostics[0].message
+    def test_responses_api_text_passes_model(self):
+        """Test the Responses API call uses the given model and returns the raw text."""
+        client = MagicMock()
+        client.responses.create.return_value = _responses_output(_MOCK_PLAN_JSON)
 
-    def test_invalid_model_returns_demo_plan(self):
-        """Test that invalid model returns demo plan with error."""
-        settings = Settings(
-            openai_model="gpt-999-nonexistent",
-            openai_temperature=0.0,
-            openai_api_key="sk-test-key",
-            default_project="",
-            dock_right=True
-        )
+        assert _responses_api_text(client, "gpt-4o", "Add resistor", {}) == _MOCK_PLAN_JSON
+        assert client.responses.create.call_args[1]["model"] == "gpt-4o"
 
-        result = plan_from_prompt("Add LED", settings=settings)
+    def test_chat_api_text_passes_temperature(self):
+        """Test the Chat API call uses the given model and temperature."""
+        client = MagicMock()
+        client.chat.completions.create.return_value = _chat_completion(_MOCK_PLAN_JSON)
 
-        assert result.plan is not None
-        assert any(d.severity == "error" and "Invalid model" in d.message for d in result.diagnostics)
+        assert _chat_api_text(client, "gpt-4o-mini", 0.7, "Add resistor") == _MOCK_PLAN_JSON
+        kwargs = client.chat.completions.create.call_args[1]
+        assert kwargs["model"] == "gpt-4o-mini"
+        assert kwargs["temperature"] == 0.7
 
-    def test_json_decode_error_returns_demo_plan(self):
-        """Test that invalid JSON response returns demo plan with error."""
-        settings = Settings(
-            openai_model="gpt-4o-mini",
-            openai_temperature=0.0,
-            openai_api_key="sk-test-key",
-            default_project="",
-            dock_right=True
-        )
+    def test_chat_api_text_rejects_empty_content(self):
+        """Test an empty completion raises instead of returning no text."""
+        client = MagicMock()
+        client.chat.completions.create.return_value = _chat_completion("")
+
+        with pytest.raises(RuntimeError, match="Empty response"):
+            _chat_api_text(client, "gpt-4o-mini", 0.0, "Add resistor")
+
+
+class TestPlanFromPromptWithMockAPI:
+    """Test plan_from_prompt with mocked OpenAI API."""
 
-        with patch("openai.OpenAI") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
+    @pytest.mark.parametrize(
+        "api,override,temp,expected_msg",
+        [
+            ("responses", "gpt-4o", 0.0, "Responses API"),
+            ("chat", None, 0.7, "Chat API"),
+        ],
+    )
+    def test_successful_plan_generation(
+        self, base_settings, mock_openai_client, api, override, temp, expected_msg
+    ):
+        """Test plan generation via each API, honouring model override and temperature."""
+        settings = replace(base_settings, openai_temperature=temp)
+        if api == "responses":
+            mock_openai_client.responses.create.return_value = _responses_output(_MOCK_PLAN_JSON)
+            create = mock_openai_client.responses.create
+        else:
+            # Responses API fails, Chat API succeeds
+            mock_openai_client.responses.create.side_effect = Exception("Responses API not available")
+            mock_openai_client.chat.completions.create.return_value = _chat_completion(_MOCK_PLAN_JSON)
+            create = mock_openai_client.chat.completions.create
 
-            # Both APIs fail, return invalid JSON
-            mock_client.responses.create.side_effect = Exception("Responses API not available")
+        result = plan_from_prompt("Add resistor", settings=settings, model_override=override)
 
-            mock_choice = MagicMock()
-            mock_choice.message.content = "This is not JSON"
-            mock_completion = MagicMock()
-            mock_completion.choices = [mock_choice]
-            mock_client.chat.completions.create.return_value = mock_completion
+        assert result.plan is not None
+        assert len(result.plan.ops) == 1
+        assert result.diagnostics[0].severity == "info"
+        assert expected_msg in result.diagnostics[0].message
+        if override:
+            assert create.call_args[1]["model"] == override
+        if api == "chat":
+            assert create.call_args[1]["temperature"] == temp
+
+    def test_invalid_model_returns_demo_plan(self, base_settings):
+        """Test that invalid model returns demo plan with error."""
+        settings = replace(base_settings, openai_model="gpt-999-nonexistent")
 
-            result = plan_from_prompt("Add LED", settings=settings)
+        result = plan_from_prompt("Add LED", settings=settings)
 
-            assert result.plan is not None
-            assert any(d.severity == "error" and "Invalid JSON" in d.message for d in result.diagnostics)
+        assert result.plan is not None
+        assert _has_diag(result.diagnostics, "error", "Invalid model")
 
-    def test_openai_api_error_returns_demo_plan(self):
-        """Test that OpenAI API error returns demo plan with warning."""
-        settings = Settings(
-            openai_model="gpt-4o-mini",
-            openai_temperature=0.0,
-            openai_api_key="sk-test-key",
-            default_project="",
-            dock_right=True
-        )
+    def test_json_decode_error_returns_demo_plan(self, base_settings, mock_openai_client):
+        """Test that invalid JSON response returns demo plan with error."""
+        # Both APIs fail, return invalid JSON
+        mock_openai_client.responses.create.side_effect = Exception("Responses API not available")
 
-        with patch("openai.OpenAI") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
+        mock_openai_client.chat.completions.create.return_value = _chat_completion("This is not JSON")
 
-            # All APIs fail
-            mock_client.responses.create.side_effect = Exception("Responses API failed")
-            mock_client.chat.completions.create.side_effect = Exception("Rate limit exceeded")
+        result = plan_from_prompt("Add LED", settings=base_settings)
 
-            result = plan_from_prompt("Add LED", settings=settings)
+        assert result.plan is not None
+        assert _has_diag(result.diagnostics, "error", "Invalid JSON")
 
-            assert result.plan is not None
-            assert any(d.severity == "warning" and "OpenAI API error" in d.message for d in result.diagnostics)
+    def test_openai_api_error_returns_demo_plan(self, base_settings, mock_openai_client):
+        """Test that OpenAI API error returns demo plan with warning."""
+        # All APIs fail
+        mock_openai_client.responses.create.side_effect = Exception("Responses API failed")
+        mock_openai_client.chat.completions.create.side_effect = Exception("Rate limit exceeded")
 
-    def test_openai_import_error_returns_demo_plan(self):
-        """Test that missing OpenAI package returns demo plan with error."""
-        settings = Settings(
-            openai_model="gpt-4o-mini",
-            openai_temperature=0.0,
-            openai_api_key="sk-test-key",
-            default_project="",
-            dock_right=True
-        )
-
-        # Patch the import itself to simulate missing package
-        import builtins
-        original_import = builtins.__import__
-
-        def mock_import(name, *args, **kwargs):
-            if name == "openai":
-                raise ImportError("No module named 'openai'")
-            return original_import(name, *args, **kwargs)
-
-        with patch("builtins.__import__", side_effect=mock_import):
-            result = plan_from_prompt("Add LED", settings=settings)
-
-            assert result.plan is not None
-            assert any(d.severity == "error" and "not installed" in d.message for d in result.diagnostics)
-
-    def test_model_override_parameter(self):
-        """Test that model_override parameter works."""
-        settings = Settings(
-            openai_model="gpt-4o-mini",
-            openai_temperature=0.0,
-            openai_api_key="sk-test-key",
-            default_project="",
-            dock_right=True
-        )
-
-        mock_plan = {
-            "plan_version": 1,
-            "ops": [
-                {"op": "add_component", "ref": "R1", "symbol": "Device:R", "value": "1k", "at": [80, 50], "rot": 0}
-            ]
-        }
-
-        with patch("openai.OpenAI") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
-
-            mock_response = MagicMock()
-            mock_response.output_text = json.dumps(mock_plan)
-            mock_client.responses.create.return_value = mock_response
-
-            result = plan_from_prompt("Add resistor", settings=settings, model_override="gpt-4o")
-
-            # Verify the override model was used
-            call_args = mock_client.responses.create.call_args
-            assert call_args[1]["model"] == "gpt-4o"
-
-    def test_temperature_setting_used(self):
-        """Test that temperature from settings is used."""
-        settings = Settings(
-            openai_model="gpt-4o-mini",
-            openai_temperature=0.7,
-            openai_api_key="sk-test-key",
-            default_project="",
-            dock_right=True
-        )
-
-        mock_plan = {
-            "plan_version": 1,
-            "ops": [
-                {"op": "add_component", "ref": "R1", "symbol": "Device:R", "value": "1k", "at": [80, 50], "rot": 0}
-            ]
-        }
-
-        with patch("openai.OpenAI") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
+        result = plan_from_prompt("Add LED", settings=base_settings)
 
-            # Responses API fails, Chat API succeeds
-            mock_client.responses.create.side_effect = Exception("Not available")
+        assert result.plan is not None
+        assert _has_diag(result.diagnostics, "warning", "OpenAI API error")
 
-            mock_choice = MagicMock()
-            mock_choice.message.content = json.dumps(mock_plan)
-            mock_completion = MagicMock()
-            mock_completion.choices = [mock_choice]
-            mock_client.chat.completions.create.return_value = mock_completion
+    def test_openai_import_error_returns_demo_plan(self, base_settings, monkeypatch):
+        """Test that missing OpenAI package returns demo plan with error."""
+        # A None entry makes `import openai` raise ImportError
+        monkeypatch.setitem(sys.modules, "openai", None)
 
-            result = plan_from_prompt("Add resistor", settings=settings)
+        result = plan_from_prompt("Add LED", settings=base_settings)
 
-            # Verify temperature was passed
-            call_args = mock_client.chat.completions.create.call_args
-            assert call_args[1]["temperature"] == 0.7
+        assert result.plan is not None
+        assert _has_diag(result.diagnostics, "error", "not installed")
\ No newline at end of file
@@ -3,7 +3,7 @@
 import json
 import os
 import tempfile
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from unittest.mock import patch
 
 import pytest
@@ -31,8 +31,6 @@ def test_get_config_dir_macos():
         with patch("pathlib.Path.home", return_value=Path("/Users/test")):
             config_dir = get_config_dir()
             # Use PurePosixPath for consistent path representation
-            from pathlib import PurePosixPath
-
             assert PurePosixPath(config_dir) == PurePosixPath("/Users/test/Library/Application Support/kAIcad")
 
 
@@ -41,8 +39,6 @@ def test_get_config_dir_linux():
     with patch("sys.platform", "linux"):
         with patch.dict(os.environ, {"XDG_CONFIG_HOME": "/home/test/.config"}, clear=False):
             config_dir = get_config_dir()
-            from pathlib import PurePosixPath
-
             assert PurePosixPath(config_dir) == PurePosixPath("/home/test/.config/kAIcad")
 
 
@@ -54,14 +50,12 @@ def test_get_config_dir_linux_no_xdg():
         with patch.dict(os.environ, env_copy, clear=True):
             with patch("pathlib.Path.home", return_value=Path("/home/test")):
                 config_dir = get_config_dir()
-                from pathlib import PurePosixPath
-
                 assert PurePosixPath(config_dir) == PurePosixPath("/home/test/.config/kAIcad")
 
 
-def test_settings_defaults():
+def test_settings_defaults(default_settings):
     """Test that Settings has correct default values."""
-    settings = Settings()
+    settings = default_settings
 
     assert settings.openai_model == "gpt-4o-mini"  # Updated to real model name
     assert settings.openai_temperature == 0.0
@@ -90,7 +84,7 @@ def test_settings_load_from_env():
                 assert settings.openai_temperature == 0.7
 
 
-def test_settings_load_from_config_file():
+def test_settings_load_from_config_file(monkeypatch):
     """Test that Settings.load() reads from config file."""
     config_data = {
         "openai_model": "gpt-4o-mini",
@@ -101,27 +95,23 @@ def test_settings_load_from_config_file():
     }
 
     # Remove env var so config file is used
-    old_key = os.environ.pop("OPENAI_API_KEY", None)
-    try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "config.json"
-            config_path.write_text(json.dumps(config_data), encoding="utf-8")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = Path(tmpdir) / "config.json"
+        config_path.write_text(json.dumps(config_data), encoding="utf-8")
 
-            with patch("kaicad.config.settings.CONFIG_PATH", config_path):
-                with patch("kaicad.config.settings.KEYRING_AVAILABLE", False):
-                    settings = Settings.load()
+        with patch("kaicad.config.settings.CONFIG_PATH", config_path):
+            with patch("kaicad.config.settings.KEYRING_AVAILABLE", False):
+                settings = Settings.load()
 
-                    assert settings.openai_model == "gpt-4o-mini"
-                    assert settings.openai_temperature == 0.5
-                    assert settings.openai_api_key == "sk-test-file-key"
-                    assert settings.default_project == "/path/to/project"
-                    assert settings.dock_right is False
-    finally:
-        if old_key:
-            os.environ["OPENAI_API_KEY"] = old_key
+                assert settings.openai_model == "gpt-4o-mini"
+                assert settings.openai_temperature == 0.5
+                assert settings.openai_api_key == "sk-test-file-key"
+                assert settings.default_project == "/path/to/project"
+                assert settings.dock_right is False
 
 
-def test_settings_load_env_overrides_config():
+def test_settings_load_env_overrides_config(monkeypatch):
     """Test that environment variables override config file for model and temperature."""
     config_data = {
         "openai_model": "gpt-4o-mini",
@@ -129,47 +119,27 @@ def test_settings_load_env_overrides_config():
         "openai_api_key": "",  # Empty in config so env can override
     }
 
-    # Save current env state
-    old_model = os.environ.get("OPENAI_MODEL")
-    old_temp = os.environ.get("OPENAI_TEMPERATURE")
-    old_key = os.environ.get("OPENAI_API_KEY")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = Path(tmpdir) / "config.json"
+        config_path.write_text(json.dumps(config_data), encoding="utf-8")
 
-    try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "config.json"
-            config_path.write_text(json.dumps(config_data), encoding="utf-8")
+        with patch("kaicad.config.settings.CONFIG_PATH", config_path):
+            with patch("kaicad.config.settings.KEYRING_AVAILABLE", False):
+                # Set environment variables (restored by monkeypatch)
+                monkeypatch.setenv("OPENAI_MODEL", "gpt-4o")
+                monkeypatch.setenv("OPENAI_TEMPERATURE", "0.7")
+                monkeypatch.setenv("OPENAI_API_KEY", "sk-env-key")
 
-            with patch("kaicad.config.settings.CONFIG_PATH", config_path):
-                with patch("kaicad.config.settings.KEYRING_AVAILABLE", False):
-                    # Set environment variables
-                    os.environ["OPENAI_MODEL"] = "gpt-4o"
-                    os.environ["OPENAI_TEMPERATURE"] = "0.7"
-                    os.environ["OPENAI_API_KEY"] = "sk-env-key"
-
-                    settings = Settings.load()
-
-                    # Env should override config for model and temp
-                    # API key uses env when config is empty
-                    assert settings.openai_model == "gpt-4o"
-                    assert settings.openai_temperature == 0.7
-                    assert settings.openai_api_key == "sk-env-key"
-    finally:
-        # Restore env
-        if old_model is not None:
-            os.environ["OPENAI_MODEL"] = old_model
-        else:
-            os.environ.pop("OPENAI_MODEL", None)
-        if old_temp is not None:
-            os.environ["OPENAI_TEMPERATURE"] = old_temp
-        else:
-            os.environ.pop("OPENAI_TEMPERATURE", None)
-        if old_key is not None:
-            os.environ["OPENAI_API_KEY"] = old_key
-        else:
-            os.environ.pop("OPENAI_API_KEY", None)
-
-
-def test_settings_load_with_keyring():
+                settings = Settings.load()
+
+                # Env should override config for model and temp
+                # API key uses env when config is empty
+                assert settings.openai_model == "gpt-4o"
+                assert settings.openai_temperature == 0.7
+                assert settings.openai_api_key == "sk-env-key"
+
+
+def test_settings_load_with_keyring(monkeypatch):
     """Test that Settings.load() uses keyring for API key."""
     if not KEYRING_AVAILABLE:
         pytest.skip("keyring not available")
@@ -177,23 +147,19 @@ def test_settings_load_with_keyring():
     config_data = {"openai_model": "gpt-4o", "openai_api_key": ""}
 
     # Remove env var so keyring is used
-    old_key = os.environ.pop("OPENAI_API_KEY", None)
-    try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "config.json"
-            config_path.write_text(json.dumps(config_data), encoding="utf-8")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = Path(tmpdir) / "config.json"
+        config_path.write_text(json.dumps(config_data), encoding="utf-8")
 
-            with patch("kaicad.config.settings.CONFIG_PATH", config_path):
-                with patch("kaicad.config.settings.keyring") as mock_keyring:
-                    mock_keyring.get_password.return_value = "sk-keyring-key"
+        with patch("kaicad.config.settings.CONFIG_PATH", config_path):
+            with patch("kaicad.config.settings.keyring") as mock_keyring:
+                mock_keyring.get_password.return_value = "sk-keyring-key"
 
-                    settings = Settings.load()
+                settings = Settings.load()
 
-                    assert settings.openai_api_key == "sk-keyring-key"
-                    mock_keyring.get_password.assert_called_once_with(KEYRING_SERVICE, KEYRING_USERNAME)
-    finally:
-        if old_key:
-            os.environ["OPENAI_API_KEY"] = old_key
+                assert settings.openai_api_key == "sk-keyring-key"
+                mock_keyring.get_password.assert_called_once_with(KEYRING_SERVICE, KEYRING_USERNAME)
 
 
 def test_settings_save():
@@ -250,13 +216,13 @@ def test_settings_save_with_keyring():
                     assert saved_data["openai_api_key"] == ""
 
 
-def test_settings_apply_env():
+def test_settings_apply_env(monkeypatch):
     """Test that Settings.apply_env() sets environment variables."""
     settings = Settings(openai_model="gpt-4o", openai_temperature=0.9, openai_api_key="sk-apply-test")
 
-    # Clear relevant env vars
+    # Clear relevant env vars; monkeypatch also undoes what apply_env() sets
     for key in ["OPENAI_MODEL", "OPENAI_TEMPERATURE", "OPENAI_API_KEY"]:
-        os.environ.pop(key, None)
+        monkeypatch.delenv(key, raising=False)
 
     settings.apply_env()
 
@@ -265,27 +231,21 @@ def test_settings_apply_env():
     assert os.environ["OPENAI_API_KEY"] == "sk-apply-test"
 
 
-def test_settings_load_invalid_config_file():
+def test_settings_load_invalid_config_file(monkeypatch):
     """Test that Settings.load() handles corrupt config file gracefully."""
-    old_model = os.environ.get("OPENAI_MODEL")
-
-    try:
-        # Clear OPENAI_MODEL to test defaults
-        os.environ.pop("OPENAI_MODEL", None)
+    # Clear OPENAI_MODEL to test defaults
+    monkeypatch.delenv("OPENAI_MODEL", raising=False)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "config.json"
-            config_path.write_text("{ invalid json }", encoding="utf-8")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = Path(tmpdir) / "config.json"
+        config_path.write_text("{ invalid json }", encoding="utf-8")
 
-            with patch("kaicad.config.settings.CONFIG_PATH", config_path):
-                with patch("kaicad.config.settings.KEYRING_AVAILABLE", False):
-                    # Should not raise, should use defaults
-                    settings = Settings.load()
+        with patch("kaicad.config.settings.CONFIG_PATH", config_path):
+            with patch("kaicad.config.settings.KEYRING_AVAILABLE", False):
+                # Should not raise, should use defaults
+                settings = Settings.load()
 
-                    assert settings.openai_model == "gpt-4o-mini"  # Updated to real model name
-    finally:
-        if old_model is not None:
-            os.environ["OPENAI_MODEL"] = old_model
+                assert settings.openai_model == "gpt-4o-mini"  # Updated to real model name
 
 
 def test_settings_save_keyring_error():
@@ -310,9 +270,10 @@ def test_settings_save_keyring_error():
                     assert config_path.exists()
 
 
-def test_settings_apply_env_empty_values():
+def test_settings_apply_env_empty_values(monkeypatch):
     """Test that Settings.apply_env() handles empty API key."""
     settings = Settings(openai_model="", openai_api_key="")
+    monkeypatch.delenv("OPENAI_TEMPERATURE", raising=False)
 
     settings.apply_env()
 